@@ -0,0 +1,180 @@
+"""Declarative badge rules for the Wellness Planner, evaluated incrementally.
+
+Every task a user ticks becomes a completion event (at most one per task per
+day). Events go to the user's completion log in the storage backend and are
+folded into a small per-user state of running counters:
+
+- ``total``: completions ever
+- ``categories``: completions per task category (see ``categorize``)
+- ``week`` / ``month``: completions in the current ISO week / calendar month
+- ``streak``: the current run of consecutive days with a completion
+
+``BADGE_RULES`` declares each badge as a threshold on one of those counters.
+Rules are indexed by counter, so an event only checks the rules whose counter
+it moved, and earned badges live in a set that is never rescanned. A render
+without new completions does no badge work at all, however long the history.
+If the state is missing (first use, or a deleted file) it is rebuilt once by
+replaying the log, seeded with the badges already on record.
+"""
+import threading
+from datetime import date, datetime
+
+import pandas as pd
+
+from storage import BADGE_COLUMNS, COMPLETION_COLUMNS
+
+# kind: "total" | "window" (window: "week" | "month") | "streak" (days) |
+#       "category" (category)
+BADGE_RULES = [
+    {"badge": "🥇 Week 1 Champ", "kind": "window", "window": "week", "count": 5,
+     "description": "Complete 5 tasks in one week"},
+    {"badge": "🏆 Month Champ", "kind": "window", "window": "month", "count": 20,
+     "description": "Complete 20 tasks in one month"},
+    {"badge": "🔥 3-Day Streak", "kind": "streak", "count": 3,
+     "description": "Complete a task 3 days in a row"},
+    {"badge": "⚡ 7-Day Streak", "kind": "streak", "count": 7,
+     "description": "Complete a task 7 days in a row"},
+    {"badge": "🌟 Century Club", "kind": "total", "count": 100,
+     "description": "Complete 100 tasks"},
+    {"badge": "💧 Hydration Hero", "kind": "category", "category": "hydration", "count": 10,
+     "description": "Complete 10 hydration tasks"},
+    {"badge": "🏃 Move Master", "kind": "category", "category": "exercise", "count": 10,
+     "description": "Complete 10 exercise tasks"},
+    {"badge": "🧘 Mindful Mind", "kind": "category", "category": "mindfulness", "count": 10,
+     "description": "Complete 10 mindfulness tasks"},
+]
+
+CATEGORY_KEYWORDS = {
+    "hydration": ("water", "drink", "hydrat"),
+    "exercise": ("walk", "run", "jog", "yoga", "stretch", "exercise", "workout", "gym", "cycl", "swim", "steps"),
+    "mindfulness": ("meditat", "breath", "journal", "gratitude", "mindful"),
+    "sleep": ("sleep", "nap", "bed"),
+}
+DEFAULT_CATEGORY = "general"
+
+
+def categorize(task):
+    text = str(task).lower()
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        if any(word in text for word in keywords):
+            return category
+    return DEFAULT_CATEGORY
+
+
+def _counter_key(rule):
+    if rule["kind"] == "window":
+        return ("window", rule["window"])
+    if rule["kind"] == "category":
+        return ("category", rule["category"])
+    return (rule["kind"], None)
+
+
+def _empty_state():
+    return {"events": 0, "total": 0, "categories": {}, "week": ["", 0], "month": ["", 0],
+            "streak": ["", 0], "day": ["", []], "earned": []}
+
+
+class BadgeEngine:
+    def __init__(self, rules=BADGE_RULES):
+        self.rules = list(rules)
+        self._by_counter = {}  # counter key -> rules, lowest threshold first
+        for rule in self.rules:
+            self._by_counter.setdefault(_counter_key(rule), []).append(rule)
+        for rules_for_key in self._by_counter.values():
+            rules_for_key.sort(key=lambda rule: rule["count"])
+
+    def _check(self, key, value, earned, unlocked):
+        for rule in self._by_counter.get(key, ()):
+            if rule["count"] > value:
+                break
+            if rule["badge"] not in earned:
+                earned.add(rule["badge"])
+                unlocked.append(rule["badge"])
+
+    def fold(self, state, event, earned, unlocked):
+        """Fold one completion event into ``state``; False if it was a repeat."""
+        day = event["timestamp"][:10]
+        if state["day"][0] != day:
+            state["day"] = [day, []]
+        if event["task_id"] in state["day"][1]:
+            return False
+        state["day"][1].append(event["task_id"])
+        state["events"] += 1
+
+        state["total"] += 1
+        self._check(("total", None), state["total"], earned, unlocked)
+
+        category = event["category"]
+        state["categories"][category] = state["categories"].get(category, 0) + 1
+        self._check(("category", category), state["categories"][category], earned, unlocked)
+
+        d = date.fromisoformat(day)
+        iso = d.isocalendar()
+        for window, period in (("week", f"{iso[0]}-W{iso[1]:02d}"), ("month", day[:7])):
+            state[window] = [period, state[window][1] + 1 if state[window][0] == period else 1]
+            self._check(("window", window), state[window][1], earned, unlocked)
+
+        last_day, length = state["streak"]
+        if last_day != day:
+            consecutive = last_day and (d - date.fromisoformat(last_day)).days == 1
+            state["streak"] = [day, length + 1 if consecutive else 1]
+            self._check(("streak", None), state["streak"][1], earned, unlocked)
+        return True
+
+    def _replay(self, storage, username):
+        state = _empty_state()
+        earned = set(storage.load_badges(username)["badge"])
+        log = storage.load_completions(username)
+        for event in log.to_dict("records"):
+            event["timestamp"] = str(event["timestamp"])
+            self.fold(state, event, earned, [])
+        state["earned"] = sorted(earned)
+        return state
+
+    def record(self, storage, username, events):
+        """Log new completion events and return the badges they unlock."""
+        if not events:
+            return []
+        accepted, unlocked = [], []
+
+        def apply(state):
+            if state is None:
+                state = self._replay(storage, username)
+            earned = set(state["earned"])
+            for event in events:
+                if self.fold(state, event, earned, unlocked):
+                    accepted.append(event)
+            state["earned"] = sorted(earned)
+            return state
+
+        storage.update_badge_state(username, apply)
+        if accepted:
+            storage.append_completions(username, pd.DataFrame(accepted, columns=COMPLETION_COLUMNS))
+        return unlocked
+
+
+def completion_events(tasks, newly_done, now=None):
+    """Events for the rows of ``tasks`` selected by the boolean ``newly_done``."""
+    timestamp = (now or datetime.now()).isoformat()
+    done = tasks[newly_done]
+    return [
+        {"timestamp": timestamp, "task_id": int(task_id), "task": task, "category": categorize(task)}
+        for task_id, task in zip(done.index, done["task"])
+    ]
+
+
+def badge_rows(badges, now=None):
+    timestamp = (now or datetime.now()).isoformat()
+    return pd.DataFrame([(badge, timestamp) for badge in badges], columns=BADGE_COLUMNS)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_badge_engine():
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = BadgeEngine()
+        return _engine
@@ -0,0 +1,175 @@
+"""Headless bulk IBW / nutrition report.
+
+Streams member records from CSV or Parquet in fixed-size chunks and writes
+one output row per input row with IBW, caloric needs, the selected diet and
+exercise plans, and the personalized plan template from plan_engine.py
+(``plan_id``, ``target_calories``; the rendered markdown too with
+``--plan-text``). Memory stays bounded by ``--chunksize`` (times the number of
+chunks in flight when ``--workers`` > 1). Streamlit is never imported.
+
+Input columns: ``age``, ``gender``, ``weight`` and either ``height`` (a height
+string such as 5'7 or 170 cm) or numeric ``height_in``. Optional ``diet_type``
+(non-vegan/vegan) and ``goal`` (one of the Exercise Planner goals). Every input
+column is passed through to the output.
+
+    python batch_cli.py members.csv -o report.parquet --workers 4
+"""
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from health_metrics import compute_metrics
+from height_parser import parse_heights
+from plan_engine import get_plan_engine
+from plans import DIET_PLANS, EXERCISE_PLANS
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def score_chunk(df, plan_text=False):
+    """Add ibw_kg, caloric_needs, the plan columns and plan_id to one chunk."""
+    if "height_in" in df.columns:
+        heights = pd.DataFrame({"inches": pd.to_numeric(df["height_in"], errors="coerce")}, index=df.index)
+        heights["cm"] = np.round(heights["inches"] * 2.54, 2)
+    else:
+        heights = parse_heights(df["height"])
+    gender = df["gender"].astype("string").str.strip().str.lower()
+    metrics = compute_metrics(pd.DataFrame({
+        "age": pd.to_numeric(df["age"], errors="coerce"),
+        "gender": gender.fillna("").to_numpy(dtype=object),
+        "weight": pd.to_numeric(df["weight"], errors="coerce"),
+        "height_in": heights["inches"],
+        "height_cm": heights["cm"],
+    }, index=df.index))
+
+    # Same gating as the UI: no plan without a valid height and a gender.
+    eligible = heights["inches"].notna() & gender.isin(["male", "female"]).fillna(False)
+    diet_type = df["diet_type"] if "diet_type" in df.columns else pd.Series("non-vegan", index=df.index)
+    goal = df["goal"] if "goal" in df.columns else pd.Series(pd.NA, index=df.index, dtype="string")
+    diet_type = diet_type.where(diet_type.isin(list(DIET_PLANS)), "non-vegan")
+    goal = goal.where(goal.isin(list(EXERCISE_PLANS)))
+
+    out = df.copy()
+    out["ibw_kg"] = metrics["ibw_kg"].where(eligible).round(2)
+    out["caloric_needs"] = metrics["caloric_needs"].where(eligible)
+    out["diet_plan"] = diet_type.where(eligible).astype("string")
+    out["exercise_plan"] = goal.where(eligible).astype("string")
+
+    plans = get_plan_engine().plan_batch(pd.DataFrame({
+        "goal": goal, "diet_type": diet_type, "calories": out["caloric_needs"], "age": df["age"],
+    }, index=df.index), text=plan_text)
+    out["plan_id"] = plans["plan_id"]
+    out["target_calories"] = plans["target_calories"]
+    if plan_text:
+        out["exercise_plan_text"] = plans["exercise"]
+        out["diet_plan_text"] = plans["diet"]
+    return out
+
+
+# ---------- Readers ----------
+def iter_chunks(path, chunksize):
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            sys.exit("Reading Parquet requires pyarrow (pip install pyarrow).")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+# ---------- Writers ----------
+class CsvWriter:
+    def __init__(self, path):
+        self.path = path
+        self._header = True
+
+    def write(self, df):
+        df.to_csv(self.path, mode="w" if self._header else "a", header=self._header, index=False)
+        self._header = False
+
+    def close(self):
+        if self._header:  # empty input still gets an (empty) file
+            open(self.path, "w").close()
+
+
+class ParquetWriter:
+    def __init__(self, path):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            sys.exit("Writing Parquet requires pyarrow (pip install pyarrow).")
+        self.path = path
+        self._writer = None
+
+    def write(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self._writer = pq.ParquetWriter(self.path, table.schema)
+        else:
+            # Later chunks may infer narrower types (e.g. all-null columns).
+            table = pa.Table.from_pandas(df, schema=self._writer.schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_writer(path):
+    return ParquetWriter(path) if path.endswith(".parquet") else CsvWriter(path)
+
+
+def run(input_path, output_path, chunksize=DEFAULT_CHUNKSIZE, workers=1, plan_text=False):
+    writer = open_writer(output_path)
+    rows = 0
+    try:
+        if workers <= 1:
+            for chunk in iter_chunks(input_path, chunksize):
+                writer.write(score_chunk(chunk, plan_text))
+                rows += len(chunk)
+        else:
+            # Keep at most 2 chunks per worker in flight and write them back
+            # in input order.
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk in iter_chunks(input_path, chunksize):
+                    pending.append(pool.submit(score_chunk, chunk, plan_text))
+                    if len(pending) >= 2 * workers:
+                        result = pending.popleft().result()
+                        writer.write(result)
+                        rows += len(result)
+                while pending:
+                    result = pending.popleft().result()
+                    writer.write(result)
+                    rows += len(result)
+    finally:
+        writer.close()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk IBW / caloric-need / plan report.")
+    parser.add_argument("input", help="member records (.csv or .parquet)")
+    parser.add_argument("-o", "--output", required=True, help="report path (.csv or .parquet)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows per chunk")
+    parser.add_argument("--workers", type=int, default=1,
+                        help=f"worker processes (default 1; this machine has {os.cpu_count()} cores)")
+    parser.add_argument("--plan-text", action="store_true",
+                        help="also write the rendered exercise and diet plan markdown")
+    args = parser.parse_args(argv)
+    rows = run(args.input, args.output, args.chunksize, args.workers, args.plan_text)
+    print(f"Wrote {rows} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
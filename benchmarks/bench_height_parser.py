@@ -0,0 +1,55 @@
+"""Rows/second for the height parser on a large synthetic column.
+
+    python benchmarks/bench_height_parser.py --rows 5000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from height_parser import parse_height, parse_heights  # noqa: E402
+
+
+def make_column(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    feet = rng.integers(4, 7, rows).astype(str)
+    inches = rng.integers(0, 12, rows).astype(str)
+    cm = rng.integers(140, 210, rows).astype(str)
+    styles = rng.integers(0, 4, rows)
+    values = np.where(styles == 0, np.char.add(np.char.add(feet, "'"), inches),
+             np.where(styles == 1, np.char.add(np.char.add(np.char.add(feet, " ft "), inches), " in"),
+             np.where(styles == 2, np.char.add(cm, " cm"), "n/a")))
+    return pd.Series(values, dtype=object)
+
+
+def timed(label, rows, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f} s  {rows / elapsed:14,.0f} rows/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--scalar-rows", type=int, default=200_000,
+                        help="rows fed through the memoized scalar parser")
+    args = parser.parse_args()
+
+    column = timed("generate column", args.rows, lambda: make_column(args.rows))
+    result = timed("parse_heights (vectorized)", args.rows, lambda: parse_heights(column))
+    print(f"valid rows: {int(result['valid'].sum()):,} / {args.rows:,}")
+
+    sample = column.iloc[:args.scalar_rows].tolist()
+    parse_height.cache_clear()
+    timed("parse_height (memoized)", len(sample), lambda: [parse_height(h) for h in sample])
+
+
+if __name__ == "__main__":
+    main()
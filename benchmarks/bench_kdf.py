@@ -0,0 +1,56 @@
+"""Pick a scrypt cost for HEALTH_SCRYPT_LOG2N.
+
+Times one hash per cost level and the throughput of a login burst on the KDF
+pool, then recommends the highest cost whose single-hash latency stays under
+the target.
+
+    python benchmarks/bench_kdf.py --target-ms 100 --burst 32
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import wait
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import credentials  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--min-log2n", type=int, default=12)
+    parser.add_argument("--max-log2n", type=int, default=17)
+    parser.add_argument("--target-ms", type=float, default=100.0, help="acceptable latency of one login")
+    parser.add_argument("--burst", type=int, default=16, help="concurrent logins per burst")
+    args = parser.parse_args()
+
+    print(f"KDF pool: {credentials.KDF_WORKERS} workers, r={credentials.SCRYPT_R}, p={credentials.SCRYPT_P}")
+    print(f"{'log2n':>5} {'mem MiB':>8} {'1 hash ms':>10} {'burst s':>8} {'logins/s':>9}")
+    best = None
+    for log2n in range(args.min_log2n, args.max_log2n + 1):
+        credentials.hash_password("warm-up", log2n=log2n)
+        start = time.perf_counter()
+        credentials.hash_password("benchmark", log2n=log2n)
+        single_ms = 1000 * (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        futures = [credentials._pool.submit(credentials._hash_sync, f"pw{i}", log2n,
+                                            credentials.SCRYPT_R, credentials.SCRYPT_P)
+                   for i in range(args.burst)]
+        wait(futures)
+        burst_s = time.perf_counter() - start
+
+        mem_mib = 128 * credentials.SCRYPT_R * (1 << log2n) / 2**20
+        print(f"{log2n:>5} {mem_mib:>8.0f} {single_ms:>10.1f} {burst_s:>8.2f} {args.burst / burst_s:>9.1f}")
+        if single_ms <= args.target_ms:
+            best = log2n
+
+    if best is None:
+        print(f"\nNo cost level meets {args.target_ms:.0f} ms; lower --min-log2n.")
+    else:
+        print(f"\nRecommended: HEALTH_SCRYPT_LOG2N={best}")
+
+
+if __name__ == "__main__":
+    main()
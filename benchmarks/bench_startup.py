@@ -0,0 +1,111 @@
+"""Cold-start and per-rerun latency of the dashboard, per sidebar tool.
+
+Runs the page script headlessly through Streamlit's AppTest harness in a
+scratch directory (so no real user data is touched).
+
+    python benchmarks/bench_startup.py --reruns 20
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "health_calc_v2.py")
+
+COLD_START = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+at = AppTest.from_file({app!r}, default_timeout=120).run()
+t2 = time.perf_counter()
+assert not at.exception, at.exception
+print(json.dumps({{
+    "import_streamlit_ms": 1000 * (t1 - t0),
+    "login_page_ms": 1000 * (t2 - t1),
+    "pyplot_loaded": "matplotlib.pyplot" in sys.modules,
+    "matplotlib_loaded": "matplotlib" in sys.modules,
+    "requests_loaded": "requests" in sys.modules,
+}}))
+"""
+
+
+def cold_start(trials):
+    runs = []
+    for _ in range(trials):
+        with tempfile.TemporaryDirectory() as work:
+            out = subprocess.run([sys.executable, "-c", COLD_START.format(root=ROOT, app=APP)],
+                                 cwd=work, capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {
+        "import_streamlit_ms": statistics.median(r["import_streamlit_ms"] for r in runs),
+        "login_page_ms": statistics.median(r["login_page_ms"] for r in runs),
+        "pyplot_loaded": any(r["pyplot_loaded"] for r in runs),
+        "matplotlib_loaded": any(r["matplotlib_loaded"] for r in runs),
+        "requests_loaded": any(r["requests_loaded"] for r in runs),
+    }
+
+
+def per_tool_reruns(reruns):
+    sys.path.insert(0, ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    from health_tools import available_tools
+
+    results = {}
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.session_state["logged_in"] = True
+    at.session_state["username"] = "bench"
+    at.session_state["is_admin"] = True
+    at.run()
+    for tool in available_tools(True):
+        start = time.perf_counter()
+        at.sidebar.selectbox[0].select(tool).run()
+        first = time.perf_counter() - start
+        assert not at.exception, (tool, at.exception)
+        times = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            at.run()
+            times.append(time.perf_counter() - start)
+        times.sort()
+        results[tool] = {
+            "first_ms": 1000 * first,
+            "p50_ms": 1000 * statistics.median(times),
+            "p95_ms": 1000 * times[min(len(times) - 1, int(0.95 * len(times)))],
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trials", type=int, default=3, help="cold-start subprocess runs")
+    parser.add_argument("--reruns", type=int, default=10, help="timed reruns per tool")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    cold = cold_start(args.trials)
+    print("Cold start (median):")
+    for key, value in cold.items():
+        print(f"  {key:<22} {value:.1f}" if isinstance(value, float) else f"  {key:<22} {value}")
+
+    with tempfile.TemporaryDirectory() as work:
+        os.chdir(work)
+        reruns = per_tool_reruns(args.reruns)
+    print(f"\n{'Tool':<32} {'first ms':>10} {'p50 ms':>10} {'p95 ms':>10}")
+    for tool, r in reruns.items():
+        print(f"{tool:<32} {r['first_ms']:>10.1f} {r['p50_ms']:>10.1f} {r['p95_ms']:>10.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"cold_start": cold, "reruns": reruns}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Build and lookup latency of the symptom index on a synthetic table.
+
+    python benchmarks/bench_symptom_index.py --rows 50000 --select 10
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from symptom_index import SymptomIndex  # noqa: E402
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ra", "tu", "so", "pe", "di", "gra", "bel", "chon", "fus", "ix"]
+
+
+def make_table(rows, symptoms, conditions, seed=0):
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < symptoms:
+        names.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))))
+    names = sorted(names)
+    return pd.DataFrame({
+        "symptom": [rng.choice(names) for _ in range(rows)],
+        "synonyms": [rng.choice(names)[::-1] if rng.random() < 0.1 else "" for _ in range(rows)],
+        "condition": [f"condition-{rng.randrange(conditions)}" for _ in range(rows)],
+        "advice": ["Consult a doctor."] * rows,
+    })
+
+
+def micro(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return 1e6 * statistics.median(times), 1e6 * times[int(0.99 * (len(times) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--symptoms", type=int, default=5_000)
+    parser.add_argument("--conditions", type=int, default=3_000)
+    parser.add_argument("--select", type=int, default=10, help="symptoms per ranked lookup")
+    parser.add_argument("--repeat", type=int, default=2_000)
+    args = parser.parse_args()
+
+    table = make_table(args.rows, args.symptoms, args.conditions)
+    start = time.perf_counter()
+    index = SymptomIndex(table)
+    print(f"build: {1000 * (time.perf_counter() - start):.0f} ms for {args.rows:,} rows "
+          f"({len(index):,} symptoms, {len(index.conditions):,} conditions)")
+
+    rng = random.Random(1)
+    selections = [rng.sample(index.symptoms, args.select) for _ in range(args.repeat)]
+    it = iter(selections)
+    p50, p99 = micro(lambda: index.rank(next(it)), args.repeat)
+    print(f"rank({args.select} symptoms): p50 {p50:.1f} µs, p99 {p99:.1f} µs")
+
+    queries = [rng.choice(index.symptoms)[:rng.randint(2, 6)] for _ in range(args.repeat)]
+    it = iter(queries)
+    p50, p99 = micro(lambda: index.search(next(it)), args.repeat)
+    print(f"search(prefix): p50 {p50:.1f} µs, p99 {p99:.1f} µs")
+
+    typos = []
+    for q in queries:
+        q = q if len(q) >= 4 else q + "ra"
+        i = rng.randrange(len(q))
+        typos.append(q[:i] + "x" + q[i + 1:])
+    it = iter(typos)
+    p50, p99 = micro(lambda: index.search(next(it)), args.repeat)
+    print(f"search(prefix, 1 typo): p50 {p50:.1f} µs, p99 {p99:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
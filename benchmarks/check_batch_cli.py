@@ -0,0 +1,48 @@
+"""Check batch_cli.py on member rows with missing or malformed fields.
+
+Scores a small CSV where some rows lack a gender, a height or an age, and
+verifies that the run completes, that those rows get no plan while their
+neighbours do, and that CSV and Parquet output agree.
+
+    python benchmarks/check_batch_cli.py
+"""
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_cli import run  # noqa: E402
+
+MEMBERS = pd.DataFrame({
+    "age": [30, 41, 25, None, 52],
+    "gender": ["Male", "", "female", "male", None],
+    "weight": [80, 70, 60, 75, 68],
+    "height": ["5'10", "170 cm", "", "6'0", "160 cm"],
+    "goal": ["Weight Loss", "Muscle Gain", "General Fitness", "Weight Loss", "Muscle Gain"],
+})
+
+
+def main():
+    with tempfile.TemporaryDirectory() as work:
+        source = os.path.join(work, "members.csv")
+        MEMBERS.to_csv(source, index=False)
+        reports = {}
+        for ext in ("csv", "parquet"):
+            target = os.path.join(work, f"report.{ext}")
+            rows = run(source, target, chunksize=2)
+            assert rows == len(MEMBERS), f"{ext}: wrote {rows} rows"
+            reports[ext] = pd.read_csv(target) if ext == "csv" else pd.read_parquet(target)
+
+    report = reports["parquet"]
+    print(report[["gender", "height", "ibw_kg", "caloric_needs", "plan_id"]])
+    assert report["ibw_kg"].notna().tolist() == [True, False, False, True, False], "eligibility"
+    assert report["plan_id"].notna().tolist() == [True, False, False, False, False], "plans"
+    assert (reports["csv"]["ibw_kg"].fillna(-1) == report["ibw_kg"].fillna(-1)).all(), "csv/parquet differ"
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
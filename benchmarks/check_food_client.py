@@ -0,0 +1,132 @@
+"""Check the food-data client against a local stub API.
+
+Starts a threaded HTTP stub on localhost that answers ``/foods`` after a fixed
+delay. It fails the first request for some foods with 503 (to exercise
+retries), never answers for a "slow" food (to exercise the deadline), and 404s
+unknown foods. The check then verifies that:
+
+- a diet plan's foods resolve in one concurrent fan-out (wall time close to one
+  request, not the sum), with in-flight requests capped at --concurrency
+- 503s are retried and 404s cached as misses
+- a repeat lookup is served entirely from the SQLite cache (no requests)
+- resolve_foods() returns by its deadline even when the API hangs
+
+    python benchmarks/check_food_client.py --delay 0.2 --concurrency 4
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from food_data import FoodCache, FoodDataClient, foods_in_plan, resolve_foods  # noqa: E402
+from plans import DIET_PLANS  # noqa: E402
+
+UNKNOWN = "egg masala"
+FLAKY = {"banana", "poha"}
+SLOW = "slow food"
+
+
+class Stub:
+    def __init__(self, delay):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.failed = set()
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                food = parse_qs(urlparse(self.path).query)["query"][0]
+                with stub.lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    fail = food in FLAKY and food not in stub.failed
+                    if fail:
+                        stub.failed.add(food)
+                try:
+                    time.sleep(60 if food == SLOW else stub.delay)
+                    if fail:
+                        self._send(503, {"error": "try again"})
+                    elif food == UNKNOWN:
+                        self._send(404, {"error": "unknown food"})
+                    else:
+                        self._send(200, {"name": food, "calories": 100 + len(food), "protein_g": 5.0,
+                                         "carbs_g": 20.0, "fat_g": 3.0})
+                finally:
+                    with stub.lock:
+                        stub.in_flight -= 1
+
+            def _send(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--delay", type=float, default=0.2, help="stub latency per request, seconds")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    stub = Stub(args.delay)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), stub.handler())
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    foods = list(dict.fromkeys(f for plan in DIET_PLANS.values() for f in foods_in_plan(plan)))
+    with tempfile.TemporaryDirectory() as work:
+        cache = FoodCache(os.path.join(work, "food_cache.db"))
+        client = FoodDataClient(url, cache=cache, max_concurrency=args.concurrency, timeout=(1.0, 2.0))
+
+        start = time.perf_counter()
+        details = resolve_foods(foods, deadline=30, client=client)
+        cold = time.perf_counter() - start
+        serial = len(foods) * args.delay
+        print(f"cold: {len(details)}/{len(foods)} foods in {cold:.2f}s "
+              f"(serial would be >= {serial:.2f}s), {stub.requests} requests, "
+              f"max in flight {stub.max_in_flight}")
+        assert stub.max_in_flight <= args.concurrency, "concurrency limit exceeded"
+        assert UNKNOWN not in details and len(details) == len(foods) - 1, "unexpected results"
+        assert stub.requests == len(foods) + len(FLAKY & set(foods)), "each 503 should be retried once"
+        assert cold < serial, "lookups did not run concurrently"
+
+        before = stub.requests
+        start = time.perf_counter()
+        again = resolve_foods(foods, deadline=30, client=client)
+        warm = time.perf_counter() - start
+        print(f"warm: {len(again)}/{len(foods)} foods in {1000 * warm:.1f}ms, {stub.requests - before} requests")
+        assert again == details and stub.requests == before, "repeat lookup left the process"
+
+        start = time.perf_counter()
+        partial = resolve_foods(["rice", SLOW], deadline=1.0, client=client)
+        waited = time.perf_counter() - start
+        print(f"deadline: returned {sorted(partial)} after {waited:.2f}s")
+        assert waited < 1.5 and "rice" in partial and SLOW not in partial, "deadline not honoured"
+
+    server.shutdown()
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Check incremental Parquet exports across several (simulated) days.
+
+Writes tasks, badges, scores and feedback for a few users on both storage
+backends over four days, with exports run at fixed times in between (the
+export's clock is passed in and CSV file mtimes are set to the simulated write
+time). It verifies that:
+
+- every row is exported exactly once, in the run after it was written
+- a row stamped just before a run (inside ``SETTLE``) waits for the next run
+- a badge earned on the day of a run, and one earned days after the previous
+  run, are both exported
+- reading the export back (``latest=True``) matches what storage holds, and a
+  user/day filter returns only that user's rows for that day
+
+    python benchmarks/check_health_export.py
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from badge_rules import badge_rows  # noqa: E402
+from health_export import export_incremental, read_export  # noqa: E402
+from storage import TASK_COLUMNS, CsvStorage, SqliteStorage  # noqa: E402
+
+DAY = datetime(2026, 1, 5)
+USERS = ["alice", "bob b", "carol/x"]
+
+
+def at(days, hour, minute=0, second=0):
+    return DAY + timedelta(days=days, hours=hour, minutes=minute, seconds=second)
+
+
+class Writer:
+    """Writes rows stamped ``when``; CSV files get ``when`` as their mtime."""
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    def _touch(self, username, when):
+        if isinstance(self.storage, CsvStorage):
+            for path in (self.storage.tasks.path(username), self.storage.badges.path(username),
+                         self.storage._score_file(username)):
+                if os.path.exists(path):
+                    os.utime(path, (when.timestamp(), when.timestamp()))
+
+    def add_task(self, username, task, when):
+        df = self.storage.load_tasks(username)
+        stamp = when.isoformat()
+        df.loc[len(df)] = [task, False, stamp, stamp, (when + timedelta(minutes=30)).isoformat()]
+        self.storage.save_tasks(username, df)
+        self._touch(username, when)
+
+    def tick(self, username, task_id, when):
+        df = self.storage.load_tasks(username)
+        df.at[task_id, "completed"] = True
+        df.at[task_id, "last_updated"] = when.isoformat()
+        self.storage.save_tasks(username, df)
+        self._touch(username, when)
+
+    def badge(self, username, badge, when):
+        self.storage.append_badges(username, badge_rows([badge], now=when))
+        self._touch(username, when)
+
+    def score(self, username, total, when):
+        self.storage.append_score(username, {"timestamp": when.isoformat(), "symptom": total,
+                                             "nutrition": 10, "exercise": 10})
+        self._touch(username, when)
+
+    def feedback(self, username, rating, when):
+        self.storage.append_feedback({"Name": username, "Rating": rating, "Comment": "ok",
+                                      "Timestamp": when.isoformat()})
+        self.storage.flush_feedback()
+
+
+def run(storage, root):
+    w = Writer(storage)
+    runs = []
+
+    def export(when, expected):
+        written = export_incremental(storage, root, now=when)
+        runs.append((when, written))
+        assert written == expected, f"export at {when}: {written} != {expected}"
+
+    # Day 0
+    w.add_task("alice", "walk", at(0, 9))
+    w.add_task("alice", "stretch", at(0, 9, 5))
+    w.add_task("bob b", "swim", at(0, 10))
+    w.score("bob b", 40, at(0, 10, 30))
+    w.badge("alice", "First Step", at(0, 11, 50))  # earned on the day of the run
+    w.feedback("carol/x", 5, at(0, 11))
+    w.score("carol/x", 35, at(0, 11, 59, 58))  # inside SETTLE of the noon run
+    export(at(0, 12), {"tasks": 3, "badges": 1, "scores": 1, "feedback": 1})
+
+    # Day 1: the held-back score, a tick and a new badge
+    w.tick("alice", 0, at(1, 9))
+    w.badge("alice", "Early Bird", at(1, 9, 1))
+    export(at(1, 10), {"tasks": 1, "badges": 1, "scores": 1, "feedback": 0})
+
+    # Day 2: nothing changed
+    export(at(2, 10), {"tasks": 0, "badges": 0, "scores": 0, "feedback": 0})
+
+    # Day 3: activity days after the previous changes
+    w.badge("bob b", "First Step", at(3, 8))
+    w.add_task("carol/x", "yoga", at(3, 8, 30))
+    w.feedback("alice", 4, at(3, 9))
+    export(at(3, 10), {"tasks": 1, "badges": 1, "scores": 0, "feedback": 1})
+    export(at(3, 11), {"tasks": 0, "badges": 0, "scores": 0, "feedback": 0})
+
+    for username in USERS:
+        tasks = read_export("tasks", username=username, latest=True, root=root)
+        expected = storage.load_tasks(username)
+        assert tasks[TASK_COLUMNS[:2]].equals(expected[TASK_COLUMNS[:2]].astype({"completed": bool})), username
+        badges = read_export("badges", username=username, latest=True, root=root)
+        assert sorted(badges["badge"]) == sorted(storage.load_badges(username)["badge"]), username
+        assert len(read_export("scores", username=username, root=root)) == len(storage.load_scores(username))
+    assert len(read_export("feedback", root=root)) == 2
+    one_day = read_export("tasks", username="alice", start=at(1, 0).date(), end=at(1, 0).date(), root=root)
+    assert one_day["task_id"].tolist() == [0] and one_day["completed"].tolist() == [True], one_day
+    return runs
+
+
+def main():
+    with tempfile.TemporaryDirectory() as work:
+        for kind in ("csv", "sqlite"):
+            os.makedirs(os.path.join(work, kind))
+            storage = (CsvStorage(os.path.join(work, kind)) if kind == "csv"
+                       else SqliteStorage(os.path.join(work, kind, "health.db")))
+            runs = run(storage, os.path.join(work, f"{kind}-export"))
+            print(kind)
+            print(pd.DataFrame([{"run": when, **written} for when, written in runs]).to_string(index=False))
+            if kind == "sqlite":
+                storage.close()
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
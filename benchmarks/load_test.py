@@ -0,0 +1,326 @@
+"""Headless multi-session load test of the dashboard.
+
+Simulates many users, each an AppTest session of the real page script.
+AppTest patches process-wide config while a script runs, so sessions can't be
+driven from several threads of one process. Instead ``--concurrency`` worker
+processes each drive their share of the sessions one step at a time, against
+the same data directory, and meet at a barrier between scenarios:
+
+    login -> ibw -> nutrition -> planner (add + tick) -> charts (+ save score) -> feedback
+
+A scratch directory is seeded first with ``--seed-users`` extra accounts and
+``--seed-tasks`` planner tasks per simulated user, so file sizes match the
+deployment being modelled. Every scenario reports throughput, latency
+percentiles, peak RSS (largest worker, and the sum over workers) and the
+bytes read/written by the workers (from /proc/self/io, where available). Results go to JSON; pass a previous run as
+``--baseline`` to print the change per scenario.
+
+    python benchmarks/load_test.py --sessions 500 --concurrency 32 --json after.json
+    python benchmarks/load_test.py --backend sqlite --baseline after.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "health_calc_v2.py")
+PASSWORD = "load-test-pw"
+SCENARIOS = ["login", "ibw", "nutrition", "planner", "charts", "feedback"]
+
+
+# ---------- Process counters ----------
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def io_bytes():
+    """``(read, written)`` by this process, including page-cache hits."""
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        return int(fields["rchar"]), int(fields["wchar"])
+    except OSError:
+        return None, None
+
+
+def percentile(ordered, q):
+    return ordered[min(int(q / 100 * len(ordered)), len(ordered) - 1)]
+
+
+# ---------- Seeding ----------
+def seed(sessions, seed_users, seed_tasks):
+    sys.path.insert(0, ROOT)
+    from credentials import hash_password
+    from storage import TASK_COLUMNS, get_storage
+
+    import pandas as pd
+
+    storage = get_storage()
+    password_hash = hash_password(PASSWORD)  # one KDF run, shared by every seeded account
+    for i in range(sessions + seed_users):
+        storage.add_user(f"user{i:05d}", password_hash)
+    if seed_tasks:
+        now = datetime.now().isoformat()
+        tasks = pd.DataFrame(
+            [(f"seeded task {j}", j % 3 == 0, now, now, now) for j in range(seed_tasks)], columns=TASK_COLUMNS
+        )
+        for i in range(sessions):
+            storage.save_tasks(f"user{i:05d}", tasks)
+
+
+# ---------- Scenarios ----------
+def _by_label(widgets, prefix):
+    return next(w for w in widgets if w.label.startswith(prefix))
+
+
+def _select_tool(at, name):
+    at.sidebar.selectbox[0].select(name).run()
+
+
+def step_login(session):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=300).run()
+    at.text_input(key="login_user").input(session["username"])
+    at.text_input(key="login_pass").input(PASSWORD)
+    _by_label(at.button, "Login").click().run()
+    if not at.session_state.logged_in:
+        raise RuntimeError(f"login failed for {session['username']}")
+    session["at"] = at
+    return at
+
+
+def step_ibw(session):
+    at = session["at"]
+    _select_tool(at, "Ideal Body Weight Calculator")
+    _by_label(at.text_input, "Enter your height").input("5'7")
+    _by_label(at.selectbox, "Select your gender").select("female")
+    _by_label(at.button, "Calculate IBW").click().run()
+    return at
+
+
+def step_nutrition(session):
+    at = session["at"]
+    _select_tool(at, "Nutrition Analyzer")
+    _by_label(at.number_input, "Enter your age").set_value(30 + session["index"] % 40)
+    _by_label(at.selectbox, "Select your gender").select("male")
+    _by_label(at.text_input, "Enter your height").input("180 cm")
+    _by_label(at.number_input, "Enter your weight").set_value(70.0)
+    _by_label(at.button, "Analyze Diet Plan").click().run()
+    return at
+
+
+def step_planner(session):
+    at = session["at"]
+    _select_tool(at, "My Wellness Planner")
+    _by_label(at.text_input, "Add a new wellness task").input(f"walk {session['index']}")
+    _by_label(at.button, "Add Task").click().run()
+    at.checkbox[-1].check().run()
+    return at
+
+
+def step_charts(session):
+    at = session["at"]
+    _select_tool(at, "📊 Health Charts")
+    _by_label(at.button, "💾 Save this score to my history").click().run()
+    return at
+
+
+def step_feedback(session):
+    at = session["at"]
+    _by_label(at.slider, "Rate your experience").set_value(1 + session["index"] % 5)
+    _by_label(at.text_area, "Comments").input(f"load test comment {session['index']}")
+    _by_label(at.button, "Submit Feedback").click().run()
+    return at
+
+
+STEPS = {
+    "login": step_login,
+    "ibw": step_ibw,
+    "nutrition": step_nutrition,
+    "planner": step_planner,
+    "charts": step_charts,
+    "feedback": step_feedback,
+}
+
+
+def timed_step(fn, session):
+    start = time.perf_counter()
+    error = None
+    try:
+        at = fn(session)
+        if at.exception:
+            error = str(at.exception[0].message)
+    except Exception as exc:  # a failed session is reported, not fatal
+        error = f"{type(exc).__name__}: {exc}"
+    return time.perf_counter() - start, error
+
+
+def worker(wid, sessions, scenarios, barrier, results):
+    """Drive this worker's sessions through every scenario, phase by phase."""
+    sys.path.insert(0, ROOT)
+    logging.disable(logging.WARNING)  # Streamlit's bare-mode and empty-label warnings, per rerun
+    for name in scenarios:
+        fn = STEPS[name]
+        live = [s for s in sessions if name == "login" or "at" in s]
+        barrier.wait()
+        read_before, written_before = io_bytes()
+        started = time.time()
+        outcomes = [timed_step(fn, s) for s in live]
+        finished = time.time()
+        read_after, written_after = io_bytes()
+        results.put({
+            "worker": wid, "scenario": name, "started": started, "finished": finished,
+            "outcomes": outcomes, "peak_rss_mb": peak_rss_mb(),
+            "read_bytes": None if read_before is None else read_after - read_before,
+            "written_bytes": None if read_before is None else written_after - written_before,
+        })
+    if wid == 0:
+        from storage import get_storage
+        get_storage().flush_feedback()
+
+
+def run(scenarios, n_sessions, concurrency):
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(concurrency)
+    queue = ctx.Queue()
+    processes = []
+    for wid in range(concurrency):
+        sessions = [{"index": i, "username": f"user{i:05d}"} for i in range(wid, n_sessions, concurrency)]
+        proc = ctx.Process(target=worker, args=(wid, sessions, scenarios, barrier, queue))
+        proc.start()
+        processes.append(proc)
+    reports = [queue.get() for _ in range(concurrency * len(scenarios))]
+    for proc in processes:
+        proc.join()
+    return {name: summarize([r for r in reports if r["scenario"] == name]) for name in scenarios}
+
+
+def summarize(reports):
+    outcomes = [o for r in reports for o in r["outcomes"]]
+    wall = max(r["finished"] for r in reports) - min(r["started"] for r in reports)
+    latencies = sorted(t for t, _ in outcomes)
+    errors = [e for _, e in outcomes if e]
+    result = {
+        "sessions": len(outcomes),
+        "errors": len(errors),
+        "throughput_per_s": len(outcomes) / wall if wall else 0.0,
+        "wall_s": wall,
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in reports),
+        "total_rss_mb": sum(r["peak_rss_mb"] for r in reports),
+    }
+    if latencies:
+        result.update({f"p{q}_ms": 1000 * percentile(latencies, q) for q in (50, 95, 99)})
+        result["max_ms"] = 1000 * latencies[-1]
+    if all(r["read_bytes"] is not None for r in reports):
+        result["read_bytes"] = sum(r["read_bytes"] for r in reports)
+        result["written_bytes"] = sum(r["written_bytes"] for r in reports)
+    if errors:
+        result["first_error"] = errors[0]
+    return result
+
+
+# ---------- Reporting ----------
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(results, baseline=None):
+    header = f"{'Scenario':<10} {'n':>5} {'err':>4} {'ops/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} " \
+             f"{'RSS MB':>8} {'read KB':>10} {'write KB':>10}"
+    print(header)
+    for name, r in results["scenarios"].items():
+        print(f"{name:<10} {r['sessions']:>5} {r['errors']:>4} {r['throughput_per_s']:>8.1f} "
+              f"{r.get('p50_ms', 0):>9.1f} {r.get('p95_ms', 0):>9.1f} {r.get('p99_ms', 0):>9.1f} "
+              f"{r['peak_rss_mb']:>8.1f} {r.get('read_bytes', 0) / 1024:>10.0f} {r.get('written_bytes', 0) / 1024:>10.0f}")
+        if r.get("first_error"):
+            print(f"{'':<10} first error: {r['first_error']}")
+    if baseline:
+        print(f"\nChange vs baseline ({baseline['meta'].get('revision')}):")
+        for name, r in results["scenarios"].items():
+            old = baseline["scenarios"].get(name)
+            if not old or not old.get("p95_ms"):
+                continue
+            print(f"  {name:<10} p95 {100 * (r['p95_ms'] / old['p95_ms'] - 1):+6.1f}%   "
+                  f"throughput {100 * (r['throughput_per_s'] / old['throughput_per_s'] - 1):+6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50, help="simulated users")
+    parser.add_argument("--concurrency", type=int, default=8, help="worker processes driving sessions")
+    parser.add_argument("--seed-users", type=int, default=1000, help="extra accounts in the user store")
+    parser.add_argument("--seed-tasks", type=int, default=20, help="planner tasks per simulated user")
+    parser.add_argument("--backend", choices=["csv", "sqlite"], default="csv")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="earlier --json output to compare against")
+    args = parser.parse_args()
+
+    scenarios = args.scenarios.split(",")
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    if scenarios[0] != "login":
+        scenarios.insert(0, "login")
+    json_path = args.json and os.path.abspath(args.json)
+    baseline_path = args.baseline and os.path.abspath(args.baseline)
+
+    with tempfile.TemporaryDirectory() as work:
+        # Storage and analytics resolve their paths on import, so the spawned
+        # processes must start with this environment and working directory.
+        os.chdir(work)
+        os.environ["HEALTH_STORAGE_BACKEND"] = args.backend
+
+        seed_start = time.perf_counter()
+        seeder = multiprocessing.get_context("spawn").Process(
+            target=seed, args=(args.sessions, args.seed_users, args.seed_tasks))
+        seeder.start()
+        seeder.join()
+        seed_s = time.perf_counter() - seed_start
+
+        results = {
+            "meta": {
+                "revision": git_revision(),
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "backend": args.backend,
+                "sessions": args.sessions,
+                "concurrency": args.concurrency,
+                "seed_users": args.seed_users,
+                "seed_tasks": args.seed_tasks,
+                "seed_s": seed_s,
+            },
+            "scenarios": {},
+        }
+        results["scenarios"] = run(scenarios, args.sessions, args.concurrency)
+
+    baseline = None
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
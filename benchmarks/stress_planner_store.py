@@ -0,0 +1,72 @@
+"""Concurrent-writer stress test for the sharded planner store.
+
+Spawns worker processes that all hammer the same user's planner through the
+same path the Wellness Planner uses (PlannerTracker -> CsvStorage): each worker
+appends its own tasks, then ticks each one off in a separate load/save cycle.
+The run fails if any append or completion is lost.
+
+    python benchmarks/stress_planner_store.py --workers 8 --tasks 25
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from change_tracking import PlannerTracker  # noqa: E402
+from storage import CsvStorage  # noqa: E402
+
+USERNAME = "stress-user"
+
+
+def worker(args):
+    root, wid, tasks = args
+    storage = CsvStorage(root)
+    for i in range(tasks):
+        tracker = PlannerTracker(storage, USERNAME)
+        df = tracker.load_tasks()
+        now = datetime.now().isoformat()
+        df.loc[len(df)] = [f"w{wid}-t{i}", False, now, now, now]
+        tracker.save_tasks(df)
+    for i in range(tasks):
+        tracker = PlannerTracker(storage, USERNAME)
+        df = tracker.load_tasks()
+        df.loc[df["task"] == f"w{wid}-t{i}", "completed"] = True
+        tracker.save_tasks(df)
+    return wid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--tasks", type=int, default=25, help="tasks appended (then completed) per worker")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        start = time.perf_counter()
+        with Pool(args.workers) as pool:
+            pool.map(worker, [(root, wid, args.tasks) for wid in range(args.workers)])
+        elapsed = time.perf_counter() - start
+
+        df = CsvStorage(root).load_tasks(USERNAME)
+        expected = {f"w{w}-t{i}" for w in range(args.workers) for i in range(args.tasks)}
+        names = df["task"].tolist()
+        missing = expected - set(names)
+        duplicated = len(names) - len(set(names))
+        not_completed = set(df.loc[~df["completed"].astype(bool), "task"])
+
+    writes = 2 * args.workers * args.tasks
+    print(f"{writes} writes from {args.workers} processes in {elapsed:.2f} s ({writes / elapsed:.0f} writes/s)")
+    print(f"rows: {len(names)} / {len(expected)} expected, missing {len(missing)}, "
+          f"duplicated {duplicated}, lost completions {len(not_completed)}")
+    if missing or duplicated or not_completed:
+        sys.exit("FAIL: lost updates detected")
+    print("OK: no lost updates")
+
+
+if __name__ == "__main__":
+    main()
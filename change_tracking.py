@@ -0,0 +1,88 @@
+"""Dirty tracking for the Wellness Planner's task and badge tables.
+
+A ``PlannerTracker`` remembers what was loaded for one user during a rerun and,
+on save, hands the storage backend only the rows that differ: appended rows
+are appended, edited rows are updated, and an unchanged table is not written
+at all. ``write_counters()`` reports how many saves were skipped or performed.
+"""
+import threading
+from collections import Counter
+
+from storage import TASK_COLUMNS
+
+_counters = Counter()
+_counters_lock = threading.Lock()
+
+
+def _count(key, n=1):
+    with _counters_lock:
+        _counters[key] += n
+
+
+def write_counters():
+    """Snapshot of save outcomes since process start (or the last reset)."""
+    with _counters_lock:
+        return dict(_counters)
+
+
+def reset_write_counters():
+    with _counters_lock:
+        _counters.clear()
+
+
+def changed_rows(before, after, columns):
+    """Positions in ``after`` that differ from ``before``.
+
+    Returns ``None`` when rows were removed, since positions no longer line
+    up and the caller has to rewrite the table.
+    """
+    if len(after) < len(before):
+        return None
+    # Compare as strings so NaN/"" and numpy/python bools from different
+    # loaders don't show up as spurious edits.
+    old = before[columns].astype(str).to_numpy()
+    new = after[columns].iloc[:len(before)].astype(str).to_numpy()
+    edited = (old != new).any(axis=1).nonzero()[0].tolist()
+    return edited + list(range(len(before), len(after)))
+
+
+class PlannerTracker:
+    def __init__(self, storage, username):
+        self.storage = storage
+        self.username = username
+        self._tasks = None
+        self._badges = None
+
+    def load_tasks(self):
+        df = self.storage.load_tasks(self.username)
+        self._tasks = df.copy()
+        return df
+
+    def save_tasks(self, df):
+        rows = changed_rows(self._tasks, df, TASK_COLUMNS)
+        if rows is None:
+            self.storage.save_tasks(self.username, df)
+            _count("tasks_full_writes")
+        elif not rows:
+            _count("tasks_skipped")
+        elif rows[0] >= len(self._tasks):
+            self.storage.append_tasks(self.username, df, len(self._tasks))
+            _count("tasks_appends")
+        else:
+            self.storage.update_tasks(self.username, df, rows)
+            _count("tasks_row_updates")
+        self._tasks = df.copy()
+
+    def load_badges(self):
+        df = self.storage.load_badges(self.username)
+        self._badges = df.copy()
+        return df
+
+    def save_badges(self, df):
+        # Badges are only ever earned, never edited, so anything new is a tail.
+        if len(df) > len(self._badges):
+            self.storage.append_badges(self.username, df.iloc[len(self._badges):])
+            _count("badges_appends")
+        else:
+            _count("badges_skipped")
+        self._badges = df.copy()
@@ -0,0 +1,131 @@
+"""Cached PNG rendering for the Health Charts tool.
+
+The three charts depend only on the (symptom, nutrition, exercise) score
+triple, so finished PNG bytes are kept in a process-wide LRU keyed by that
+triple. Hits never touch matplotlib; misses draw on standalone ``Figure``
+objects (no pyplot registry) that are cleared as soon as they are saved.
+"""
+import io
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from instrumentation import timed
+
+CHART_COLORS = ['#ff9999', '#66b3ff', '#99ff99']
+CACHE_MAX_ENTRIES = 256
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+def _to_png(fig):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    FigureCanvasAgg(fig)
+    buf = io.BytesIO()
+    try:
+        fig.savefig(buf, format="png")
+    finally:
+        fig.clear()
+    return buf.getvalue()
+
+
+@timed("render:charts")
+def render_charts(symptom_score, nutrition_score, exercise_score):
+    """Draw the pie, bar and radar charts and return their PNG bytes."""
+    from matplotlib.figure import Figure
+
+    # Pie Chart
+    fig1 = Figure()
+    ax1 = fig1.subplots()
+    pie_labels = ['Symptom', 'Nutrition', 'Exercise']
+    pie_values = [symptom_score, nutrition_score, exercise_score]
+    ax1.pie(pie_values, labels=pie_labels, autopct='%1.1f%%', startangle=90, colors=CHART_COLORS)
+    ax1.axis('equal')
+    pie = _to_png(fig1)
+
+    # Bar Chart
+    fig2 = Figure()
+    ax2 = fig2.subplots()
+    categories = ['Symptom\n(/50)', 'Nutrition\n(/25)', 'Exercise\n(/25)']
+    values = [symptom_score, nutrition_score, exercise_score]
+    ax2.bar(categories, values, color=CHART_COLORS)
+    ax2.set_ylabel('Score')
+    ax2.set_title('Health Score Breakdown')
+    bar = _to_png(fig2)
+
+    # Radar Chart
+    categories = ['Symptom', 'Nutrition', 'Exercise']
+    values = [symptom_score, nutrition_score, exercise_score]
+    values += values[:1]  # Complete the circle
+    angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
+    angles += angles[:1]
+
+    fig3 = Figure()
+    ax3 = fig3.subplots(subplot_kw=dict(polar=True))
+    ax3.plot(angles, values, color='teal', linewidth=2)
+    ax3.fill(angles, values, color='teal', alpha=0.3)
+    ax3.set_yticklabels([])
+    ax3.set_xticks(angles[:-1])
+    ax3.set_xticklabels(categories)
+    ax3.set_title("Health Score Radar", y=1.1)
+    radar = _to_png(fig3)
+
+    return pie, bar, radar
+
+
+class ChartCache:
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "render_seconds": 0.0}
+
+    def get(self, symptom_score, nutrition_score, exercise_score):
+        key = (int(symptom_score), int(nutrition_score), int(exercise_score))
+        with self._lock:
+            charts = self._entries.get(key)
+            if charts is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return charts
+            self._stats["misses"] += 1
+
+        # Render outside the lock so other sessions' hits aren't blocked.
+        start = time.perf_counter()
+        charts = render_charts(*key)
+        elapsed = time.perf_counter() - start
+
+        size = sum(len(png) for png in charts)
+        with self._lock:
+            self._stats["render_seconds"] += elapsed
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = charts
+                self._bytes += size
+                while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= sum(len(png) for png in evicted)
+                    self._stats["evictions"] += 1
+        return charts
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries), bytes=self._bytes)
+        stats["avg_render_ms"] = 1000 * stats["render_seconds"] / stats["misses"] if stats["misses"] else 0.0
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+chart_cache = ChartCache()
+
+
+def get_health_charts(symptom_score, nutrition_score, exercise_score):
+    """(pie, bar, radar) PNG bytes for the given scores, served from the cache."""
+    return chart_cache.get(symptom_score, nutrition_score, exercise_score)
@@ -0,0 +1,139 @@
+"""Salted, tunable password hashing.
+
+New hashes use scrypt and are stored as ``scrypt$<log2 n>$<r>$<p>$<salt>$<key>``
+(salt and key base64). Bare 64-character hex values are the legacy unsalted
+SHA-256 hashes; they still verify, and ``authenticate`` rewrites them with the
+current parameters on the next successful login.
+
+KDF work runs on a small bounded thread pool (hashlib.scrypt releases the GIL),
+so a burst of logins queues there instead of stalling every Streamlit session.
+A successful verification is remembered for ``VERIFY_CACHE_TTL`` seconds,
+keyed by an HMAC of the credentials under a per-process secret, so reruns with
+the same credentials never pay for the KDF again.
+
+Tune the cost with ``HEALTH_SCRYPT_LOG2N`` (see benchmarks/bench_kdf.py).
+"""
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+SCRYPT_LOG2N = int(os.environ.get("HEALTH_SCRYPT_LOG2N", "14"))
+SCRYPT_R = int(os.environ.get("HEALTH_SCRYPT_R", "8"))
+SCRYPT_P = int(os.environ.get("HEALTH_SCRYPT_P", "1"))
+KDF_WORKERS = int(os.environ.get("HEALTH_KDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+VERIFY_CACHE_TTL = float(os.environ.get("HEALTH_VERIFY_CACHE_TTL", "300"))
+VERIFY_CACHE_SIZE = 10_000
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+_pool = ThreadPoolExecutor(max_workers=KDF_WORKERS, thread_name_prefix="kdf")
+
+
+# ---------- Hashing ----------
+def _b64(raw):
+    return base64.b64encode(raw).decode("ascii")
+
+
+def _scrypt(password, salt, log2n, r, p):
+    n = 1 << log2n
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r + (1 << 20), dklen=KEY_BYTES)
+
+
+def _hash_sync(password, log2n, r, p):
+    salt = secrets.token_bytes(SALT_BYTES)
+    key = _scrypt(password, salt, log2n, r, p)
+    return f"scrypt${log2n}${r}${p}${_b64(salt)}${_b64(key)}"
+
+
+def _verify_sync(stored, password):
+    if stored.startswith("scrypt$"):
+        _, log2n, r, p, salt, key = stored.split("$")
+        log2n, r, p = int(log2n), int(r), int(p)
+        candidate = _scrypt(password, base64.b64decode(salt), log2n, r, p)
+        ok = hmac.compare_digest(candidate, base64.b64decode(key))
+        return ok, ok and (log2n, r, p) != (SCRYPT_LOG2N, SCRYPT_R, SCRYPT_P)
+    legacy = hashlib.sha256(password.encode()).hexdigest()
+    ok = hmac.compare_digest(legacy.encode(), stored.encode())
+    return ok, ok
+
+
+def hash_password(password, log2n=None, r=None, p=None):
+    """Return an encoded scrypt hash, computed on the KDF pool."""
+    return _pool.submit(
+        _hash_sync, password,
+        SCRYPT_LOG2N if log2n is None else log2n,
+        SCRYPT_R if r is None else r,
+        SCRYPT_P if p is None else p,
+    ).result()
+
+
+def verify_password(stored, password):
+    """Return ``(matches, needs_rehash)`` for an encoded or legacy hash."""
+    if not stored:
+        return False, False
+    try:
+        return _pool.submit(_verify_sync, stored, password).result()
+    except ValueError:  # malformed stored value
+        return False, False
+
+
+# ---------- Verified-session cache ----------
+_cache_secret = secrets.token_bytes(32)
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_key(username, password):
+    return hmac.new(_cache_secret, f"{username}\0{password}".encode(), hashlib.sha256).digest()
+
+
+def _cache_hit(key, stored):
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return False
+        cached_stored, expires = entry
+        # A changed stored hash (password reset, upgrade elsewhere) invalidates.
+        if expires < time.monotonic() or cached_stored != stored:
+            del _cache[key]
+            return False
+        return True
+
+
+def _cache_put(key, stored):
+    with _cache_lock:
+        _cache[key] = (stored, time.monotonic() + VERIFY_CACHE_TTL)
+        _cache.move_to_end(key)
+        while len(_cache) > VERIFY_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def clear_verify_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def authenticate(storage, username, password):
+    """Check credentials against ``storage``, upgrading outdated hashes."""
+    stored = storage.get_password_hash(username)
+    if stored is None:
+        return False
+    key = _cache_key(username, password)
+    if _cache_hit(key, stored):
+        return True
+    ok, needs_rehash = verify_password(stored, password)
+    if not ok:
+        return False
+    if needs_rehash:
+        stored = hash_password(password)
+        storage.update_password(username, stored)
+    _cache_put(key, stored)
+    return True
@@ -0,0 +1,234 @@
+"""Buffered, segmented feedback log.
+
+Submissions go into an in-memory buffer and are written in batches, either when
+``batch_size`` entries are pending or every ``flush_interval`` seconds (via a
+background thread), with an fsync per batch. Entries land in CSV segments
+(``feedback-YYYYMMDD-NNNN.csv``) that rotate on a new day or once a segment
+passes ``max_segment_bytes``. Closed segments are compacted to Parquet when
+pyarrow is available.
+
+``manifest.json`` records every segment's row count plus running aggregates
+(total count, rating histogram, count per day), updated per batch. So the
+admin view can fetch one page by reading only the segments that cover it, and
+can show stats without reading any rows.
+"""
+import atexit
+import csv
+import json
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from locking import file_lock
+
+FEEDBACK_COLUMNS = ["Name", "Rating", "Comment", "Timestamp"]
+FEEDBACK_DIR = "feedback"
+LEGACY_FEEDBACK_FILE = "feedback.csv"
+
+
+def _empty_manifest():
+    return {"segments": [], "stats": {"count": 0, "ratings": {}, "per_day": {}}}
+
+
+class FeedbackLog:
+    def __init__(self, root=FEEDBACK_DIR, legacy_file=LEGACY_FEEDBACK_FILE,
+                 batch_size=20, flush_interval=1.0, max_segment_bytes=1 << 20):
+        self.root = root
+        self.legacy_file = legacy_file
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_segment_bytes = max_segment_bytes
+        self.manifest_path = os.path.join(root, "manifest.json")
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher = None
+        os.makedirs(root, exist_ok=True)
+        self._adopt_legacy_file()
+        atexit.register(self.flush)
+
+    # ---------- Manifest ----------
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return _empty_manifest()
+
+    def _write_manifest(self, manifest):
+        tmp = f"{self.manifest_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.manifest_path)
+
+    @staticmethod
+    def _add_stats(stats, entries):
+        stats["count"] += len(entries)
+        for entry in entries:
+            rating = str(entry["Rating"])
+            day = str(entry["Timestamp"])[:10]
+            stats["ratings"][rating] = stats["ratings"].get(rating, 0) + 1
+            stats["per_day"][day] = stats["per_day"].get(day, 0) + 1
+
+    def _adopt_legacy_file(self):
+        """Move a pre-existing feedback.csv in as the oldest segment, once."""
+        if not self.legacy_file or not os.path.exists(self.legacy_file):
+            return
+        with file_lock(self.manifest_path):
+            if not os.path.exists(self.legacy_file):
+                return
+            manifest = self._read_manifest()
+            df = pd.read_csv(self.legacy_file)
+            name = "feedback-00000000-0000.csv"
+            os.replace(self.legacy_file, os.path.join(self.root, name))
+            manifest["segments"].insert(0, {"name": name, "rows": len(df)})
+            self._add_stats(manifest["stats"], df.to_dict("records"))
+            self._write_manifest(manifest)
+
+    # ---------- Writing ----------
+    def submit(self, entry):
+        """Queue one feedback entry; it is durable after the next flush."""
+        with self._buffer_lock:
+            self._buffer.append(entry)
+            full = len(self._buffer) >= self.batch_size
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._run_flusher, name="feedback-flush", daemon=True)
+                self._flusher.start()
+        if full:
+            self._wakeup.set()
+
+    def _run_flusher(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def _current_segment(self, manifest, today):
+        if manifest["segments"]:
+            last = manifest["segments"][-1]
+            path = os.path.join(self.root, last["name"])
+            if (last["name"].endswith(".csv") and last["name"][9:17] == today
+                    and os.path.exists(path) and os.path.getsize(path) < self.max_segment_bytes):
+                return last
+        seq = sum(1 for seg in manifest["segments"] if seg["name"][9:17] == today)
+        segment = {"name": f"feedback-{today}-{seq:04d}.csv", "rows": 0}
+        manifest["segments"].append(segment)
+        return segment
+
+    def flush(self):
+        """Write all buffered entries as one batch (fsynced)."""
+        with self._flush_lock:
+            with self._buffer_lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+            rotated = False
+            with file_lock(self.manifest_path):
+                manifest = self._read_manifest()
+                count_before = len(manifest["segments"])
+                segment = self._current_segment(manifest, datetime.now().strftime("%Y%m%d"))
+                rotated = len(manifest["segments"]) != count_before and count_before > 0
+                path = os.path.join(self.root, segment["name"])
+                new_file = not os.path.exists(path)
+                with open(path, "a", newline="", encoding="utf-8") as f:
+                    writer = csv.DictWriter(f, fieldnames=FEEDBACK_COLUMNS, extrasaction="ignore", lineterminator="\n")
+                    if new_file:
+                        writer.writeheader()
+                    writer.writerows(batch)
+                    f.flush()
+                    os.fsync(f.fileno())
+                segment["rows"] += len(batch)
+                self._add_stats(manifest["stats"], batch)
+                self._write_manifest(manifest)
+            if rotated:
+                self.compact()
+            return len(batch)
+
+    def compact(self):
+        """Convert every closed CSV segment to Parquet (needs pyarrow)."""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return 0
+        converted = 0
+        with file_lock(self.manifest_path):
+            manifest = self._read_manifest()
+            for segment in manifest["segments"][:-1]:
+                if not segment["name"].endswith(".csv"):
+                    continue
+                src = os.path.join(self.root, segment["name"])
+                dst_name = segment["name"][:-4] + ".parquet"
+                pd.read_csv(src, dtype={"Name": "string", "Comment": "string", "Timestamp": "string"}) \
+                    .to_parquet(os.path.join(self.root, dst_name), index=False)
+                segment["name"] = dst_name
+                self._write_manifest(manifest)
+                os.remove(src)
+                converted += 1
+        return converted
+
+    # ---------- Reading ----------
+    def _read_segment(self, name):
+        path = os.path.join(self.root, name)
+        if name.endswith(".parquet"):
+            return pd.read_parquet(path)
+        return pd.read_csv(path)
+
+    def stats(self):
+        return self._read_manifest()["stats"]
+
+    def total(self):
+        return self.stats()["count"]
+
+    def _read_consistent(self, read):
+        """``read(segments)`` against the current manifest.
+
+        compact() may replace a listed CSV segment by its Parquet copy while
+        this runs; the read is then retried once under the manifest lock.
+        """
+        try:
+            return read(self._read_manifest()["segments"])
+        except FileNotFoundError:
+            with file_lock(self.manifest_path):
+                return read(self._read_manifest()["segments"])
+
+    def page(self, page, page_size=50):
+        """Entries on ``page`` (0-based), newest first.
+
+        Only the segments overlapping the requested rows are read.
+        """
+        def read(segments):
+            total = sum(seg["rows"] for seg in segments)
+            end = total - page * page_size
+            start = max(end - page_size, 0)
+            if end <= 0:
+                return pd.DataFrame(columns=FEEDBACK_COLUMNS)
+            frames = []
+            offset = 0
+            for seg in segments:
+                seg_start, seg_end = offset, offset + seg["rows"]
+                offset = seg_end
+                if seg_end <= start or seg_start >= end:
+                    continue
+                df = self._read_segment(seg["name"])
+                frames.append(df.iloc[max(start - seg_start, 0):end - seg_start])
+            rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=FEEDBACK_COLUMNS)
+            return rows.iloc[::-1].reset_index(drop=True)
+
+        return self._read_consistent(read)
+
+    def read_since(self, timestamp=""):
+        """Entries with a Timestamp after ``timestamp``; older days' segments are skipped."""
+        day = timestamp[:10].replace("-", "")
+        frames = self._read_consistent(
+            lambda segments: [self._read_segment(seg["name"]) for seg in segments if seg["name"][9:17] >= day])
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=FEEDBACK_COLUMNS)
+        return df[df["Timestamp"].astype(str) > timestamp] if timestamp else df
+
+    def read_all(self):
+        frames = self._read_consistent(lambda segments: [self._read_segment(seg["name"]) for seg in segments])
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=FEEDBACK_COLUMNS)
@@ -0,0 +1,191 @@
+"""Per-food calorie and macro data from an external food-database API.
+
+The API is configured with ``HEALTH_FOOD_API_URL``; without it enrichment is
+off and nothing here touches the network. The client expects
+
+    GET <url>/foods?query=<food>  ->  200 {"name", "calories", "protein_g", "carbs_g", "fat_g"}
+                                      404 when the food is unknown
+
+with values per 100 g. ``FoodDataClient.lookup_many()`` resolves a whole list
+of foods in one asyncio fan-out: cached foods are answered from a local SQLite
+TTL cache (``HEALTH_FOOD_CACHE_PATH``) and the rest are fetched concurrently.
+Requests run on worker threads over one pooled ``requests.Session``. The
+connection pool blocks at ``HEALTH_FOOD_MAX_CONCURRENCY``, which caps
+connections across all sessions; a per-call semaphore caps each fan-out.
+Every request has connect/read timeouts and is retried with backoff on
+connection errors, 429 and 5xx.
+
+``resolve_foods()`` is the synchronous entry point for the page script. It
+waits at most ``deadline`` seconds and returns whatever resolved by then, so a
+slow API never stalls a rerun for long; late answers still land in the cache.
+"""
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+FOOD_API_URL = os.environ.get("HEALTH_FOOD_API_URL")
+FOOD_API_KEY = os.environ.get("HEALTH_FOOD_API_KEY")
+FOOD_CACHE_PATH = os.environ.get("HEALTH_FOOD_CACHE_PATH", "food_cache.db")
+FOOD_CACHE_TTL = float(os.environ.get("HEALTH_FOOD_CACHE_TTL", 7 * 24 * 3600))
+NOT_FOUND_TTL = 24 * 3600
+MAX_CONCURRENCY = int(os.environ.get("HEALTH_FOOD_MAX_CONCURRENCY", 8))
+TIMEOUT = (3.05, 5.0)  # (connect, read) seconds
+RETRIES = 2
+BACKOFF = 0.25  # seconds, doubled per retry
+DEADLINE = 4.0
+NUTRIENT_FIELDS = ["calories", "protein_g", "carbs_g", "fat_g"]
+
+_NOT_FOUND = {}  # cached negative answer
+_MEAL_LINE = re.compile(r"\*\*(?:Breakfast|Lunch|Dinner|Snacks?):\*\*\s*(.+)", re.IGNORECASE)
+_FOOD_SPLIT = re.compile(r",|\s+with\s+|\s+and\s+|\s*&\s*", re.IGNORECASE)
+
+
+def foods_in_plan(markdown):
+    """Distinct food names from the meal lines of a diet plan, in order."""
+    foods = []
+    for line in markdown.splitlines():
+        match = _MEAL_LINE.search(line)
+        if match:
+            for food in _FOOD_SPLIT.split(match.group(1)):
+                food = food.strip(" .").lower()
+                if food and food not in foods:
+                    foods.append(food)
+    return foods
+
+
+class FoodCache:
+    def __init__(self, path=FOOD_CACHE_PATH, ttl=FOOD_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS foods (query TEXT PRIMARY KEY, payload TEXT NOT NULL, "
+            "expires REAL NOT NULL) WITHOUT ROWID"
+        )
+
+    def get_many(self, queries):
+        """``{query: payload}`` for the fresh entries among ``queries``."""
+        if not queries:
+            return {}
+        marks = ",".join("?" * len(queries))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT query, payload FROM foods WHERE query IN ({marks}) AND expires > ?",
+                (*queries, time.time()),
+            ).fetchall()
+        return {query: json.loads(payload) for query, payload in rows}
+
+    def put(self, query, payload, ttl=None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO foods VALUES (?, ?, ?)",
+                (query, json.dumps(payload), time.time() + (self.ttl if ttl is None else ttl)),
+            )
+
+
+class FoodDataClient:
+    def __init__(self, base_url=FOOD_API_URL, api_key=FOOD_API_KEY, cache=None,
+                 max_concurrency=MAX_CONCURRENCY, timeout=TIMEOUT, retries=RETRIES):
+        # Imported here so sessions that never look up a food don't load requests.
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache or FoodCache()
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self._requests = requests
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+    def _fetch(self, food):
+        """One GET; returns the payload, ``_NOT_FOUND`` or raises for a retry."""
+        response = self.session.get(f"{self.base_url}/foods", params={"query": food}, timeout=self.timeout)
+        if response.status_code == 404:
+            return _NOT_FOUND
+        response.raise_for_status()
+        data = response.json()
+        return {"name": data.get("name", food), **{field: data.get(field) for field in NUTRIENT_FIELDS}}
+
+    def _retryable(self, exc):
+        requests = self._requests
+        if not isinstance(exc, (requests.ConnectionError, requests.Timeout, requests.HTTPError)):
+            return False
+        response = exc.response
+        return response is None or response.status_code == 429 or response.status_code >= 500
+
+    async def lookup(self, food, semaphore):
+        for attempt in range(self.retries + 1):
+            try:
+                async with semaphore:
+                    payload = await asyncio.to_thread(self._fetch, food)
+            except Exception as exc:
+                if attempt == self.retries or not self._retryable(exc):
+                    return None  # not cached: the next lookup tries again
+                await asyncio.sleep(BACKOFF * 2 ** attempt)
+                continue
+            self.cache.put(food, payload, NOT_FOUND_TTL if payload is _NOT_FOUND else None)
+            return payload or None
+        return None
+
+    async def lookup_many(self, foods):
+        """``{food: payload or None}`` for every food, fetching misses concurrently."""
+        foods = list(dict.fromkeys(food.strip().lower() for food in foods if food.strip()))
+        cached = self.cache.get_many(foods)
+        results = {food: cached[food] or None for food in foods if food in cached}
+        misses = [food for food in foods if food not in cached]
+        if misses:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            fetched = await asyncio.gather(*(self.lookup(food, semaphore) for food in misses))
+            results.update(zip(misses, fetched))
+        return results
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_food_client():
+    """The shared client, or None when no API is configured."""
+    global _client
+    if not FOOD_API_URL:
+        return None
+    with _client_lock:
+        if _client is None:
+            _client = FoodDataClient()
+        return _client
+
+
+def resolve_foods(foods, deadline=DEADLINE, client=None):
+    """Nutrient data per food, waiting at most ``deadline`` seconds.
+
+    Foods still in flight at the deadline are left out (and keep resolving in
+    the background into the cache). Returns ``{}`` when no API is configured.
+    """
+    client = client or get_food_client()
+    if client is None or not foods:
+        return {}
+    box = {}
+
+    def run():
+        box["result"] = asyncio.run(client.lookup_many(foods))
+
+    # A separate thread owns the event loop, so the caller isn't tied to it
+    # past the deadline and never needs a loop of its own.
+    worker = threading.Thread(target=run, name="food-lookup", daemon=True)
+    worker.start()
+    worker.join(deadline)
+    if "result" in box:
+        return {food: data for food, data in box["result"].items() if data}
+    names = list(dict.fromkeys(food.strip().lower() for food in foods))
+    return {food: data for food, data in client.cache.get_many(names).items() if data}
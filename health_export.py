@@ -0,0 +1,176 @@
+"""Columnar export and import of the full user health history.
+
+``export_incremental()`` writes planner tasks, badges, wellness scores and
+feedback as Parquet under ``HEALTH_EXPORT_DIR``:
+
+    <dir>/<dataset>/day=YYYY-MM-DD/part-<run>.parquet
+
+partitioned by the day each row last changed and sorted by user, so the
+min/max statistics of a row group cover few users. A run only exports what
+changed since the previous one: ``_export_state.json`` keeps a watermark per
+dataset (the cutoff time of the last run) and storage skips per-user files not
+modified since. A task that changes again is written again; readers pass
+``latest=True`` to keep only its newest version.
+
+``read_export()`` reads a dataset through ``pyarrow.dataset`` from memory
+mapped files, loading only the requested columns with the user and date
+filters pushed down: day partitions outside the range are never opened and row
+groups whose statistics exclude the user are skipped. ``import_export()`` loads
+an export into a storage backend, e.g. to move a deployment from CSV to SQLite.
+Accounts are not part of an export: SqliteStorage adopts users.csv itself.
+"""
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from locking import file_lock
+from storage import CHANGE_COLUMNS, EXPORT_COLUMNS
+
+EXPORT_DIR = os.environ.get("HEALTH_EXPORT_DIR", "export")
+STATE_FILE = "_export_state.json"
+ROW_GROUP_ROWS = 64 * 1024
+# Rows stamped within this long before a run are left for the next one, so a
+# write whose timestamp was taken just before the run but landed after the
+# read can't fall behind the watermark.
+SETTLE = timedelta(seconds=5)
+DATASETS = ["tasks", "badges", "scores", "feedback"]
+USER_COLUMNS = {"tasks": "username", "badges": "username", "scores": "username", "feedback": "Name"}
+# Rows that describe the same record; with latest=True only the newest is kept.
+KEY_COLUMNS = {"tasks": ["username", "task_id"], "badges": ["username", "badge"]}
+
+_export_lock = threading.Lock()
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.fs as pafs
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)") from exc
+    return pa, ds, pafs, pq
+
+
+def _schema(dataset):
+    pa = _pyarrow()[0]
+    types = {"task_id": pa.int64(), "completed": pa.bool_(), "symptom": pa.int64(), "nutrition": pa.int64(),
+             "exercise": pa.int64(), "Rating": pa.int64()}
+    return pa.schema([(name, types.get(name, pa.string())) for name in EXPORT_COLUMNS[dataset]])
+
+
+def _to_table(df, schema):
+    pa = _pyarrow()[0]
+    df = df.copy()
+    for field in schema:
+        if pa.types.is_integer(field.type):
+            df[field.name] = pd.to_numeric(df[field.name], errors="coerce").astype("Int64")
+        elif pa.types.is_boolean(field.type):
+            df[field.name] = df[field.name].astype(str).str.lower().isin(["true", "1"])
+        else:
+            df[field.name] = df[field.name].astype("string")
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+# _read_state/_write_state are only called under the state file's lock.
+def _read_state(root):
+    path = os.path.join(root, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_state(root, state):
+    fd, tmp = tempfile.mkstemp(dir=root, prefix=".tmp_state_")
+    with os.fdopen(fd, "w") as f:
+        json.dump(state, f, indent=1)
+    os.replace(tmp, os.path.join(root, STATE_FILE))
+
+
+def export_incremental(storage, root=EXPORT_DIR, datasets=DATASETS, now=None):
+    """Export rows changed since the last run; returns ``{dataset: rows written}``."""
+    pq = _pyarrow()[3]
+    os.makedirs(root, exist_ok=True)
+    now = now or datetime.now()
+    run = now.strftime("%Y%m%dT%H%M%S%f")
+    cutoff = (now - SETTLE).isoformat()
+    written = {}
+    # The lock spans reading the watermarks, exporting and advancing them, so
+    # concurrent exports (threads or processes) run one after the other.
+    with _export_lock, file_lock(os.path.join(root, STATE_FILE)):
+        state = _read_state(root)
+        for dataset in datasets:
+            column, user = CHANGE_COLUMNS[dataset], USER_COLUMNS[dataset]
+            since = state.get(dataset, "")
+            df = storage.export_rows(dataset, since)
+            df = df.assign(**{column: df[column].astype(str)})
+            df = df[df[column] <= cutoff]
+            written[dataset] = len(df)
+            df = df.sort_values([user, column], kind="stable")
+            schema = _schema(dataset)
+            for day, part in df.groupby(df[column].str[:10], sort=True):
+                directory = os.path.join(root, dataset, f"day={day}")
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp_")
+                os.close(fd)
+                pq.write_table(_to_table(part, schema), tmp, row_group_size=ROW_GROUP_ROWS)
+                os.replace(tmp, os.path.join(directory, f"part-{run}.parquet"))
+            # Saved per dataset, so a failure later in the run doesn't re-export this one.
+            state[dataset] = max(since, cutoff)
+            _write_state(root, state)
+    return written
+
+
+def read_export(dataset, username=None, start=None, end=None, columns=None, latest=False, root=EXPORT_DIR):
+    """Read an exported dataset, optionally for one user and a day range.
+
+    ``start`` and ``end`` are dates or ISO strings (inclusive, by the day the
+    row changed). ``columns`` limits what is read from disk.
+    """
+    pa, ds, pafs, _ = _pyarrow()
+    schema = _schema(dataset)
+    columns = list(columns or schema.names)
+    directory = os.path.join(root, dataset)
+    if not os.path.isdir(directory):
+        return pd.DataFrame(columns=columns)
+
+    day = pa.field("day", pa.string())
+    data = ds.dataset(
+        directory, format="parquet", schema=schema.append(day),
+        partitioning=ds.partitioning(pa.schema([day]), flavor="hive"),
+        filesystem=pafs.LocalFileSystem(use_mmap=True),
+    )
+    condition = None
+    for expr in [
+        ds.field(USER_COLUMNS[dataset]) == username if username is not None else None,
+        ds.field("day") >= str(start)[:10] if start else None,
+        ds.field("day") <= str(end)[:10] if end else None,
+    ]:
+        if expr is not None:
+            condition = expr if condition is None else condition & expr
+    keys = KEY_COLUMNS.get(dataset, []) if latest else []
+    needed = list(dict.fromkeys(columns + keys + ([CHANGE_COLUMNS[dataset]] if keys else [])))
+    df = data.to_table(columns=needed, filter=condition).to_pandas()
+    if keys:
+        df = (df.sort_values(CHANGE_COLUMNS[dataset], kind="stable")
+                .drop_duplicates(keys, keep="last").sort_values(keys))
+    return df[columns].reset_index(drop=True)
+
+
+def import_export(storage, root=EXPORT_DIR, datasets=DATASETS):
+    """Load an export into ``storage``; returns ``{dataset: rows imported}``.
+
+    Meant for an empty target: scores and feedback are appended as they are.
+    """
+    imported = {}
+    for dataset in datasets:
+        df = read_export(dataset, latest=dataset in KEY_COLUMNS, root=root)
+        if not df.empty:
+            storage.import_rows(dataset, df)
+        imported[dataset] = len(df)
+    return imported
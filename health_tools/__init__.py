@@ -0,0 +1,34 @@
+"""Sidebar tools of the Health Assistant Dashboard.
+
+Each tool is a module exposing ``render()``. A tool module is imported the
+first time it is selected and then stays in ``sys.modules``, so a rerun only
+pays for the tool on screen and heavy dependencies (matplotlib for the charts)
+never load for sessions that don't use them. Each render is timed as a
+``tool:<name>`` span (see instrumentation.py).
+"""
+import importlib
+
+from instrumentation import span
+
+TOOLS = {
+    "Ideal Body Weight Calculator": "ibw",
+    "Exercise Planner": "exercise",
+    "Nutrition Analyzer": "nutrition",
+    "Symptom Checker": "symptoms",
+    "📊 Health Charts": "health_charts",
+    "My Wellness Planner": "planner",
+    "🔬 View Feedback": "feedback",
+    "📈 Population Trends": "population",
+    "⏱ Performance": "performance",
+    "🗄️ Data Export": "data_export",
+}
+ADMIN_TOOLS = {"🔬 View Feedback", "📈 Population Trends", "⏱ Performance", "🗄️ Data Export"}
+
+
+def available_tools(is_admin):
+    return [name for name in TOOLS if is_admin or name not in ADMIN_TOOLS]
+
+
+def render_tool(name):
+    with span(f"tool:{name}"):
+        importlib.import_module(f"{__name__}.{TOOLS[name]}").render()
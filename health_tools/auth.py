@@ -0,0 +1,75 @@
+"""Login / sign-up page and credential helpers."""
+import streamlit as st
+
+from credentials import authenticate, hash_password
+from instrumentation import timed
+from storage import get_storage
+
+
+@timed("io:save_user")
+def save_user(username, password):
+    get_storage().add_user(username, hash_password(password))
+
+
+@timed("io:check_user")
+def check_user(username, password):
+    return authenticate(get_storage(), username, password)
+
+
+def render_login(admin_password):
+    st.title("💪 Health Assistant Dashboard")
+    st.write("Welcome! Please login or sign up to continue.")
+
+    tab1, tab2 = st.tabs(["🔐 Login", "📝 Sign Up"])
+
+    with tab1:
+        st.subheader("Login to Your Account")
+        username_login = st.text_input("Username", key="login_user")
+        password_login = st.text_input("Password", type="password", key="login_pass")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Login", use_container_width=True):
+                if check_user(username_login, password_login):
+                    st.session_state.logged_in = True
+                    st.session_state.username = username_login
+                    st.success(f"Welcome back, {username_login}!")
+                    st.rerun()
+                else:
+                    st.error("Invalid username or password.")
+
+        with col2:
+            # Admin login option
+            if st.button("Admin Login", use_container_width=True):
+                admin_pass = st.text_input("Enter admin password", type="password", key="admin_login")
+                if admin_pass == admin_password:
+                    st.session_state.is_admin = True
+                    st.session_state.logged_in = True
+                    st.session_state.username = "Admin"
+                    st.success("Admin access granted.")
+                    st.rerun()
+                elif admin_pass:
+                    st.error("Incorrect admin password.")
+
+    with tab2:
+        st.subheader("Create New Account")
+        username_reg = st.text_input("Choose Username", key="reg_user")
+        password_reg = st.text_input("Choose Password", type="password", key="reg_pass")
+        password_confirm = st.text_input("Confirm Password", type="password", key="reg_pass_confirm")
+
+        if st.button("Sign Up", use_container_width=True):
+            if not username_reg or not password_reg:
+                st.warning("Please enter both username and password.")
+            elif password_reg != password_confirm:
+                st.error("Passwords do not match!")
+            else:
+                storage = get_storage()
+                if not storage.users_valid():
+                    st.error("Corrupted user file. Please contact admin.")
+                elif storage.user_exists(username_reg):
+                    st.error("Username already exists. Please choose another.")
+                else:
+                    save_user(username_reg, password_reg)
+                    st.success("Registration successful! You can now log in.")
+
+    st.stop()  # Stop here if not logged in
@@ -0,0 +1,37 @@
+"""Admin-only Parquet export, query and import of the user health history."""
+from datetime import date, timedelta
+
+import streamlit as st
+
+from health_export import DATASETS, EXPORT_DIR, SETTLE, export_incremental, import_export, read_export
+from storage import EXPORT_COLUMNS, get_storage
+
+
+def render():
+    st.header("🗄️ Data Export")
+    st.caption(f"Export directory: {EXPORT_DIR} · changes from the last {SETTLE.seconds} seconds "
+               "are left for the next export")
+    if st.button("Export changes since the last run"):
+        written = export_incremental(get_storage())
+        st.success("Exported " + ", ".join(f"{rows} {name}" for name, rows in written.items()))
+
+    st.subheader("Query the export")
+    dataset = st.selectbox("Dataset", DATASETS)
+    username = st.text_input("User (blank for everyone)").strip() or None
+    col1, col2 = st.columns(2)
+    start = col1.date_input("From", value=date.today() - timedelta(days=30))
+    end = col2.date_input("To", value=date.today())
+    names = EXPORT_COLUMNS[dataset]
+    columns = st.multiselect("Columns", names, default=names)
+    latest = st.checkbox("Latest version of each task or badge only", value=True)
+    if columns:
+        df = read_export(dataset, username=username, start=start, end=end, columns=columns, latest=latest)
+        st.write(f"{len(df)} rows")
+        st.dataframe(df)
+
+    st.subheader("Import")
+    st.caption("Loads the whole export into the current storage backend; meant for an empty one.")
+    confirm = st.checkbox("I understand this replaces task lists and appends scores and feedback")
+    if st.button("Import export", disabled=not confirm):
+        imported = import_export(get_storage())
+        st.success("Imported " + ", ".join(f"{rows} {name}" for name, rows in imported.items()))
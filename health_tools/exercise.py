@@ -0,0 +1,37 @@
+"""Exercise Planner tool."""
+import streamlit as st
+
+from health_metrics import caloric_needs_for
+from health_tools.profile import GENDER_OPTIONS, load_profile, option_index, remember
+from height_parser import convert_height_to_cm
+from plan_engine import get_plan_engine
+from plans import FITNESS_GOALS
+
+
+def render():
+    st.header("🧘 Exercise Planner")
+    profile = load_profile()
+    age = st.number_input("Enter your age", min_value=1, max_value=120, step=1, value=profile.age or 1)
+    gen = st.selectbox("Select your gender", options=GENDER_OPTIONS, index=option_index(GENDER_OPTIONS, profile.gender))
+    if gen == "-- Select --":
+        gen = None
+
+    height_str = st.text_input("Enter your height (e.g., 5'7 or 5 ft 7 in)", value=profile.height)
+    weight = st.number_input("Enter your weight in kg", min_value=10.0, max_value=300.0, step=0.1,
+                             value=profile.weight or 10.0)
+    goal = st.selectbox("What's your fitness goal?", FITNESS_GOALS, index=option_index(FITNESS_GOALS, profile.goal))
+
+    if st.button("Get Plan"):
+        height_cm = convert_height_to_cm(height_str)
+        if height_cm is None:
+            st.error("Please enter a valid height.")
+        elif gen is None:
+            st.error("Please select a gender.")
+        else:
+            st.success("Here's your recommended fitness plan:")
+
+            calories = caloric_needs_for(weight, height_cm, age, gen)
+            st.markdown(get_plan_engine().plan(goal, None, calories, age)["exercise"])
+
+            st.session_state.exercise_score = 25
+            remember(age=age, gender=gen, height=height_str, weight=weight, goal=goal, exercise_score=25)
@@ -0,0 +1,82 @@
+"""Feedback form shown on every page and the admin-only feedback viewer."""
+from datetime import datetime
+
+import streamlit as st
+
+from instrumentation import span
+from storage import get_storage
+
+# Floating Feedback Button
+FEEDBACK_BUTTON_HTML = """
+    <style>
+        #feedback-btn {
+            position: fixed;
+            bottom: 20px;
+            right: 20px;
+            background-color: #f63366;
+            color: white;
+            border: none;
+            padding: 10px 15px;
+            border-radius: 8px;
+            font-size: 16px;
+            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+            z-index: 100;
+        }
+    </style>
+    <script>
+        function showForm() {
+            var el = window.parent.document.querySelector("details[open]");
+            if (!el) {
+                window.parent.document.querySelector("details").setAttribute("open", "true");
+            }
+        }
+    </script>
+    <button id="feedback-btn" onclick="showForm()">Feedback</button>
+"""
+
+
+PAGE_SIZE = 50
+
+
+def render():
+    st.header("🔬 User Feedback")
+    storage = get_storage()
+    stats = storage.feedback_stats()
+    if not stats["count"]:
+        st.info("No feedback received yet.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Total feedback", stats["count"])
+        st.bar_chart({int(k): v for k, v in sorted(stats["ratings"].items())}, x_label="Rating", y_label="Count")
+    with col2:
+        ratings = stats["ratings"]
+        st.metric("Average rating", f"{sum(int(k) * v for k, v in ratings.items()) / stats['count']:.2f}")
+        st.line_chart(stats["per_day"], x_label="Day", y_label="Submissions")
+
+    pages = (stats["count"] - 1) // PAGE_SIZE + 1
+    page = st.number_input(f"Page (newest first, {pages} total)", min_value=1, max_value=pages, value=1)
+    st.dataframe(storage.feedback_page(page - 1, PAGE_SIZE))
+
+
+def render_form():
+    st.markdown(FEEDBACK_BUTTON_HTML, unsafe_allow_html=True)
+
+    with st.expander("Submit Feedback"):
+        st.subheader("📝 We'd love your feedback!")
+        name = st.text_input("Your Name (optional)")
+        rating = st.slider("Rate your experience (1-5)", 1, 5, 3)
+        comment = st.text_area("Comments")
+
+        if st.button("Submit Feedback"):
+            feedback_entry = {
+                "Name": name if name else "Anonymous",
+                "Rating": rating,
+                "Comment": comment,
+                "Timestamp": datetime.now().isoformat()
+            }
+            with span("io:append_feedback"):
+                get_storage().append_feedback(feedback_entry)
+
+            st.success("Thank you for your feedback!")
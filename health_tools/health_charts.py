@@ -0,0 +1,43 @@
+"""Health Charts tool; matplotlib is only loaded on a chart-cache miss."""
+import streamlit as st
+
+from charts import chart_cache, get_health_charts
+from health_tools.wellness import render_trend, save_score_button
+
+
+def render():
+    st.header("📊 Visualize Your Health Scores")
+
+    symptom_score = max(50 - len(st.session_state.get("selected_symptoms", [])) * 5, 0) if "selected_symptoms" in st.session_state else 50
+    nutrition_score = st.session_state.get("nutrition_score", 0)
+    exercise_score = st.session_state.get("exercise_score", 0)
+    total_score = symptom_score + nutrition_score + exercise_score
+
+    pie_png, bar_png, radar_png = get_health_charts(symptom_score, nutrition_score, exercise_score)
+
+    # Pie Chart
+    st.subheader("🥧 Score Distribution - Pie Chart")
+    st.image(pie_png)
+
+    # Bar Chart
+    st.subheader("📊 Score Comparison - Bar Chart")
+    st.image(bar_png)
+
+    # Radar Chart
+    st.subheader("🕸️ Health Score Radar")
+    st.image(radar_png)
+
+    st.markdown("---")
+    st.write(f"**Symptom Score:** {symptom_score}/50")
+    st.write(f"**Nutrition Score:** {nutrition_score}/25")
+    st.write(f"**Exercise Score:** {exercise_score}/25")
+    st.success(f"✅ Total Wellness Score: {total_score}/100")
+
+    save_score_button(symptom_score, nutrition_score, exercise_score, key="save_score_charts")
+    render_trend()
+
+    if st.session_state.get("is_admin"):
+        stats = chart_cache.stats()
+        st.caption(f"Chart cache: {stats['hits']} hits, {stats['misses']} misses, "
+                   f"{stats['entries']} entries ({stats['bytes'] // 1024} KiB), "
+                   f"avg render {stats['avg_render_ms']:.0f} ms")
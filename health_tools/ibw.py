@@ -0,0 +1,26 @@
+"""Ideal Body Weight Calculator tool."""
+import streamlit as st
+
+from health_metrics import ibw_for
+from health_tools.profile import GENDER_OPTIONS, load_profile, option_index, remember
+from height_parser import height_to_inches
+
+
+def render():
+    st.header("🏋️ Ideal Body Weight (IBW) Calculator")
+    profile = load_profile()
+    height_str = st.text_input("Enter your height (e.g., 5'7 or 5 ft 7 in)", value=profile.height)
+    gen = st.selectbox("Select your gender", options=GENDER_OPTIONS, index=option_index(GENDER_OPTIONS, profile.gender))
+    if gen == "-- Select --":
+        gen = None
+
+    if st.button("Calculate IBW"):
+        height_in = height_to_inches(height_str)
+        if height_in is None:
+            st.error("Please enter a valid height.")
+        elif gen is None:
+            st.error("Please select a gender.")
+        else:
+            ibw = ibw_for(height_in, gen)
+            remember(height=height_str, gender=gen)
+            st.success(f"Your Ideal Body Weight is approximately {ibw:.2f} kg")
@@ -0,0 +1,58 @@
+"""Nutrition Analyzer tool."""
+import pandas as pd
+import streamlit as st
+
+from food_data import foods_in_plan, get_food_client, resolve_foods
+from health_metrics import caloric_needs_for
+from health_tools.profile import GENDER_OPTIONS, load_profile, option_index, remember
+from height_parser import convert_height_to_cm
+from plan_engine import get_plan_engine
+from plans import DIET_TYPES
+
+
+def render_food_details(diet_markdown):
+    if get_food_client() is None:
+        return
+    foods = foods_in_plan(diet_markdown)
+    details = resolve_foods(foods)
+    if details:
+        st.subheader("🥗 Food details (per 100 g)")
+        st.dataframe(pd.DataFrame.from_dict(details, orient="index").set_index("name"))
+    if len(details) < len(foods):
+        st.caption(f"No data (yet) for {len(foods) - len(details)} of {len(foods)} foods.")
+
+
+def render():
+    st.header("🍽️ Nutrition Analyzer")
+    st.write("This tool estimates your daily caloric needs and suggests a South Indian-style diet plan.")
+
+    profile = load_profile()
+    age = st.number_input("Enter your age", min_value=1, max_value=120, step=1, value=profile.age or 1)
+    gen = st.selectbox("Select your gender", options=GENDER_OPTIONS, index=option_index(GENDER_OPTIONS, profile.gender))
+    height_str = st.text_input("Enter your height (e.g., 5'7 or 5 ft 7 in)", value=profile.height)
+    weight = st.number_input("Enter your weight in kg", min_value=10.0, max_value=300.0, step=0.1,
+                             value=profile.weight or 10.0)
+    diet_type = st.radio("Are you vegan or non-vegan?", DIET_TYPES, index=option_index(DIET_TYPES, profile.diet_type))
+
+    if st.button("Analyze Diet Plan"):
+        if gen == "-- Select --":
+            st.error("Please select a gender.")
+        elif not height_str:
+            st.error("Please enter your height.")
+        else:
+            height_cm = convert_height_to_cm(height_str)
+            if height_cm is None:
+                st.error("Invalid height format. Please use formats like 5'7, 5 ft 7 in or 170 cm.")
+            else:
+                caloric_needs = caloric_needs_for(weight, height_cm, age, gen)
+                st.success("Nutrition analysis complete!")
+                st.write(f"Your estimated daily caloric need is **{caloric_needs} calories**.")
+
+                st.subheader(f"Here's a sample {diet_type} South Indian-style diet plan:")
+                diet = get_plan_engine().plan(None, diet_type, caloric_needs, age)["diet"]
+                st.markdown(diet)
+                render_food_details(diet)
+
+                st.session_state.nutrition_score = 25
+                remember(age=age, gender=gen, height=height_str, weight=weight, diet_type=diet_type,
+                         nutrition_score=25)
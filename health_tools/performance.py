@@ -0,0 +1,38 @@
+"""Admin-only latency panel over the instrumentation registry."""
+import pandas as pd
+import streamlit as st
+
+from instrumentation import METRICS_LOG, METRICS_PORT, registry
+
+
+def render():
+    st.header("⏱ Performance")
+    summary = registry.summary()
+    if not summary:
+        st.info("No spans recorded yet in this process.")
+    else:
+        table = pd.DataFrame.from_dict(summary, orient="index")
+        table.index.name = "span"
+        tools = table[table.index.str.startswith("tool:")]
+        io_calls = table[~table.index.str.startswith("tool:")]
+        st.subheader("Sidebar tools")
+        st.dataframe(tools.style.format({c: "{:.1f}" for c in tools.columns if c.endswith("_ms")}))
+        st.subheader("I/O and rendering calls")
+        st.dataframe(io_calls.style.format({c: "{:.1f}" for c in io_calls.columns if c.endswith("_ms")}))
+        st.caption("Percentiles over the most recent samples per span; counts since process start.")
+    if METRICS_PORT:
+        st.caption(f"Prometheus metrics: http://127.0.0.1:{METRICS_PORT}/metrics")
+    if METRICS_LOG:
+        st.caption(f"Span log: {METRICS_LOG}")
+    if st.button("Reset measurements"):
+        registry.reset()
+        st.rerun()
+
+    st.subheader("cProfile capture")
+    if st.button("Profile the next rerun"):
+        st.session_state.profile_next_rerun = True
+    if st.session_state.get("profile_next_rerun"):
+        st.caption("Armed: switch to the tool you want to profile; the report shows here afterwards.")
+    report = st.session_state.get("profile_report")
+    if report:
+        st.code(report, language="text")
@@ -0,0 +1,89 @@
+"""My Wellness Planner tool."""
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from badge_rules import badge_rows, completion_events, get_badge_engine
+from change_tracking import PlannerTracker, write_counters
+from instrumentation import timed
+from planner_schedule import deadline_for, scheduler, time_left
+from storage import TASK_COLUMNS, get_storage
+
+
+@timed("io:load_wellness_tasks")
+def load_wellness_tasks(tracker):
+    return tracker.load_tasks()
+
+
+@timed("io:save_wellness_tasks")
+def save_wellness_tasks(tracker, df):
+    tracker.save_tasks(df)
+
+
+def render():
+    st.header("🧘 My Wellness Planner")
+    storage = get_storage()
+    # Auto-reset daily task completion (once per user per day)
+    scheduler.ensure_reset(storage, st.session_state.username)
+    planner = PlannerTracker(storage, st.session_state.username)
+    df_tasks = load_wellness_tasks(planner)
+
+    with st.form("add_task_form"):
+        new_task = st.text_input("Add a new wellness task")
+        duration = st.number_input("Time (in minutes) to complete this task", min_value=1, max_value=1440, value=30)
+        submit = st.form_submit_button("Add Task")
+        if submit and new_task:
+            now = datetime.now()
+            df_tasks = df_tasks[TASK_COLUMNS]
+            df_tasks.loc[len(df_tasks)] = [new_task, False, now.isoformat(), now.isoformat(), deadline_for(now, duration)]
+            save_wellness_tasks(planner, df_tasks)
+            st.success("Task added!")
+
+    was_done = df_tasks['completed'].astype(bool)
+    labels, overdue = time_left(df_tasks)
+    for idx, task_text, done, label, late in zip(df_tasks.index, df_tasks['task'], df_tasks['completed'], labels, overdue):
+        col1, col2 = st.columns([0.1, 0.9])
+        with col1:
+            if st.checkbox("", key=f"task_{idx}", value=done):
+                if not done:
+                    df_tasks.at[idx, 'last_updated'] = datetime.now().isoformat()
+                df_tasks.at[idx, 'completed'] = True
+        with col2:
+            if not late:
+                st.markdown(f"**{task_text}** ⏳ Time left: `{label}`")
+            else:
+                st.markdown(f"**{task_text}** ❌ Time's up!")
+
+    save_wellness_tasks(planner, df_tasks)
+
+    st.markdown("---")
+    st.subheader("🏋 Weekly & Monthly Badges")
+    engine = get_badge_engine()
+    events = completion_events(df_tasks, df_tasks['completed'].astype(bool) & ~was_done)
+    unlocked = engine.record(storage, st.session_state.username, events)
+
+    badge_history = planner.load_badges()
+    if unlocked:
+        badge_history = pd.concat([badge_history, badge_rows(unlocked)], ignore_index=True)
+        for badge in unlocked:
+            st.success(f"{badge} Badge Unlocked!")
+    planner.save_badges(badge_history)
+
+    with st.expander("📜 View Badge History"):
+        if len(badge_history):
+            for i, row in badge_history.iterrows():
+                st.markdown(f"{row['badge']} — _earned on {row['date'].split('T')[0]}_")
+        else:
+            st.info("No badges earned yet.")
+
+    with st.expander("🔮 Sneak Peek: Upcoming Badges"):
+        earned = set(badge_history['badge'])
+        for rule in engine.rules:
+            if rule['badge'] not in earned:
+                st.markdown(f"- {rule['description']}: {rule['badge']}")
+
+    if st.session_state.get("is_admin"):
+        counters = write_counters()
+        skipped = sum(v for k, v in counters.items() if k.endswith("_skipped"))
+        st.caption(f"Planner saves since start: {sum(counters.values()) - skipped} written, {skipped} skipped")
@@ -0,0 +1,31 @@
+"""Admin-only population trends built from the incremental score aggregates."""
+from datetime import date, timedelta
+
+import streamlit as st
+
+from score_analytics import get_analytics
+
+
+def render():
+    st.header("📈 Population Wellness Trends")
+    days = st.selectbox("Period", [7, 30, 90, 365], index=1, format_func=lambda d: f"Last {d} days")
+    start = (date.today() - timedelta(days=days - 1)).isoformat()
+
+    analytics = get_analytics()
+    daily = analytics.daily_means(start=start)
+    if daily.empty:
+        st.info("No wellness scores recorded in this period.")
+        return
+
+    pct = analytics.percentiles((50, 90, 99), start=start)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Scores", int(daily["count"].sum()))
+    col2.metric("Median total", pct.get(50, "–"))
+    col3.metric("P90 total", pct.get(90, "–"))
+    col4.metric("P99 total", pct.get(99, "–"))
+
+    daily = daily.set_index("day")
+    st.subheader("Mean scores per day")
+    st.line_chart(daily[["total", "symptom", "nutrition", "exercise"]])
+    st.subheader("Scores recorded per day")
+    st.bar_chart(daily["count"])
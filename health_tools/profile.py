@@ -0,0 +1,33 @@
+"""Session glue for the shared profile store (see profile_store.py)."""
+import streamlit as st
+
+from profile_store import get_profile_store
+
+GENDER_OPTIONS = ["-- Select --", "male", "female"]
+
+
+def hydrate_session():
+    """Restore the user's scores and symptoms into a fresh (or switched) session."""
+    username = st.session_state.username
+    if st.session_state.get("profile_user") == username:
+        return
+    profile = get_profile_store().load(username)
+    st.session_state.nutrition_score = profile.nutrition_score
+    st.session_state.exercise_score = profile.exercise_score
+    if profile.selected_symptoms:
+        st.session_state.selected_symptoms = list(profile.selected_symptoms)
+    else:
+        st.session_state.pop("selected_symptoms", None)
+    st.session_state.profile_user = username
+
+
+def load_profile():
+    return get_profile_store().load(st.session_state.username)
+
+
+def remember(**changes):
+    return get_profile_store().update(st.session_state.username, **changes)
+
+
+def option_index(options, value, default=0):
+    return options.index(value) if value in options else default
@@ -0,0 +1,57 @@
+"""Symptom Checker tool."""
+import streamlit as st
+
+from health_tools.profile import remember
+from health_tools.wellness import save_score_button
+from symptom_index import get_symptom_index
+
+SEARCH_LIMIT = 50
+
+
+def render():
+    st.header("🤔 Symptom Checker")
+    index = get_symptom_index()
+
+    # The search box narrows the options; current picks always stay available.
+    # They are appended after the results so that picking one doesn't change
+    # the options (and with them the widget's identity).
+    query = st.text_input("Search symptoms", placeholder="Type to search (typos are OK)")
+    previous = list(st.session_state.get("selected_symptoms", []))
+    options = index.search(query, limit=SEARCH_LIMIT) if query else index.symptoms[:SEARCH_LIMIT]
+    options = options + [sym for sym in previous if sym not in options]
+
+    # Keyed, so a pick sticks across reruns. Streamlit drops a widget's key
+    # while another tool is shown, so it is re-seeded from selected_symptoms.
+    if "symptom_picker" not in st.session_state:
+        st.session_state.symptom_picker = previous
+    selected = st.multiselect("Select symptoms", options, key="symptom_picker")
+    st.session_state.selected_symptoms = selected
+    if selected != previous:
+        remember(selected_symptoms=selected)
+
+    if selected:
+        for sym in selected:
+            cause, solution = index.info(sym)
+            st.subheader(sym.capitalize())
+            st.write(f"**Cause:** {cause}")
+            st.write(f"**Solution:** {solution}")
+
+        ranked = index.rank(selected)
+        if len(selected) > 1 and ranked:
+            st.markdown("---")
+            st.subheader("🩺 Possible Causes")
+            for condition, matched, coverage in ranked:
+                st.write(f"**{condition}** — matches {matched} of your {len(selected)} symptoms")
+
+        symptom_score = max(50 - len(selected) * 5, 0)
+        total_score = symptom_score + st.session_state.nutrition_score + st.session_state.exercise_score
+
+        st.markdown("---")
+        st.header("🌟 Your Overall Wellness Score")
+        st.write(f"**Symptom Score:** {symptom_score}/50")
+        st.write(f"**Nutrition Score:** {st.session_state.nutrition_score}/25")
+        st.write(f"**Exercise Score:** {st.session_state.exercise_score}/25")
+        st.success(f"✅ Total Score: {total_score}/100")
+
+        save_score_button(symptom_score, st.session_state.nutrition_score, st.session_state.exercise_score,
+                          key="save_score_symptoms")
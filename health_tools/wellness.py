@@ -0,0 +1,41 @@
+"""Shared helpers for persisting and plotting a user's wellness scores."""
+import pandas as pd
+import streamlit as st
+
+from score_analytics import ROLLING_WINDOW, get_analytics, record_scores
+from storage import get_storage
+
+TREND_POINTS = 90
+
+
+def save_score_button(symptom_score, nutrition_score, exercise_score, key):
+    """Offer to save the score triple to the user's history.
+
+    Scores are only recorded on this explicit action, so selections made on
+    the way to the final one never reach the history or the aggregates.
+    """
+    if st.session_state.get("is_admin"):
+        return
+    scores = (symptom_score, nutrition_score, exercise_score)
+    if st.session_state.get("recorded_scores") == scores:
+        st.caption("✔️ This score is saved to your history.")
+        return
+    if st.button("💾 Save this score to my history", key=key):
+        record_scores(st.session_state.username, *scores)
+        st.session_state.recorded_scores = scores
+        st.rerun()
+
+
+def render_trend():
+    username = st.session_state.username
+    history = get_storage().load_scores(username, limit=TREND_POINTS)
+    if len(history) < 2:
+        return
+    st.subheader("📈 Your Wellness Trend")
+    history["timestamp"] = pd.to_datetime(history["timestamp"])
+    history["total"] = history[["symptom", "nutrition", "exercise"]].sum(axis=1)
+    st.line_chart(history.set_index("timestamp")[["total", "symptom", "nutrition", "exercise"]])
+    summary = get_analytics().user_summary(username)
+    if summary:
+        st.caption(f"{summary['count']} scores recorded · last {min(summary['count'], ROLLING_WINDOW)} average "
+                   f"{summary['rolling_mean']:.1f} · smoothed {summary['ewma']:.1f}")
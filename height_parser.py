@@ -0,0 +1,90 @@
+"""Height string parsing shared by the UI tools and bulk imports.
+
+Accepted formats (case-insensitive, surrounding whitespace ignored):
+
+- feet/inches: ``5'7``, ``5' 7"``, ``5'``, ``5 ft 7 in``, ``5ft7``, ``5 feet``
+- inches only: ``67 in``, ``67"``
+- metric: ``170 cm``, ``1.70 m``
+
+``parse_height`` memoizes single strings; ``parse_heights`` handles a whole
+Series with one ``str.extract`` over its distinct values.
+"""
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+CM_PER_INCH = 2.54
+
+_NUM = r"\d+(?:\.\d+)?"
+_INCH_UNIT = r"(?:\"|''|in\.?|inch(?:es)?)"
+HEIGHT_PATTERN = re.compile(
+    r"^\s*(?:"
+    rf"(?P<feet>\d+)\s*(?:'|ft\.?|feet|foot)\s*(?:(?P<inches>{_NUM})\s*{_INCH_UNIT}?)?"
+    rf"|(?P<only_inches>{_NUM})\s*{_INCH_UNIT}"
+    rf"|(?P<cm>{_NUM})\s*cm"
+    r"|(?P<m>\d(?:\.\d+)?)\s*m"
+    r")\s*$",
+    re.IGNORECASE,
+)
+
+
+def _whole(value):
+    return int(value) if float(value).is_integer() else value
+
+
+@lru_cache(maxsize=4096)
+def parse_height(height_str):
+    """Return ``(inches, cm)`` for a height string, or ``None`` if unparseable."""
+    if not isinstance(height_str, str):
+        return None
+    match = HEIGHT_PATTERN.match(height_str)
+    if match is None:
+        return None
+    feet, inches, only_inches, cm, m = match.groups()
+    if feet is not None:
+        total = _whole(int(feet) * 12 + (float(inches) if inches else 0))
+    elif only_inches is not None:
+        total = _whole(float(only_inches))
+    else:
+        cm = float(cm) if cm is not None else float(m) * 100
+        return (cm / CM_PER_INCH, round(cm, 2)) if cm > 0 else None
+    return (total, round(total * CM_PER_INCH, 2)) if total > 0 else None
+
+
+def height_to_inches(height_str):
+    parsed = parse_height(height_str)
+    return parsed[0] if parsed else None
+
+
+def convert_height_to_cm(height_str):
+    parsed = parse_height(height_str)
+    return parsed[1] if parsed else None
+
+
+def parse_heights(heights):
+    """Vectorized ``parse_height`` over a Series.
+
+    Returns a DataFrame on the same index with float ``inches`` and ``cm``
+    columns and a boolean ``valid`` mask (NaN where invalid). Parsing runs
+    once per distinct string, so columns with repeated values stay cheap.
+    """
+    heights = pd.Series(heights)
+    codes, uniques = pd.factorize(heights)
+    parts = pd.Series(uniques, dtype=object).astype(str).str.extract(HEIGHT_PATTERN).astype(float)
+
+    imperial = parts["feet"] * 12 + parts["inches"].fillna(0)
+    inches = imperial.fillna(parts["only_inches"])
+    metric_cm = parts["cm"].fillna(parts["m"] * 100)
+    inches = inches.fillna(metric_cm / CM_PER_INCH).to_numpy()
+    cm = np.where(np.isnan(metric_cm), np.round(inches * CM_PER_INCH, 2), np.round(metric_cm, 2))
+    valid = inches > 0
+    inches = np.where(valid, inches, np.nan)
+    cm = np.where(valid, cm, np.nan)
+
+    # Missing values factorize to -1; route them to an extra invalid slot.
+    inches = np.append(inches, np.nan)[codes]
+    cm = np.append(cm, np.nan)[codes]
+    valid = np.append(valid, False)[codes]
+    return pd.DataFrame({"inches": inches, "cm": cm, "valid": valid}, index=heights.index)
@@ -0,0 +1,218 @@
+"""Lightweight timing spans for the dashboard's hot paths.
+
+``span(name)`` (a context manager) and ``timed(name)`` (a decorator) record the
+wall time of a block into a process-wide registry. Each span name keeps:
+
+- cumulative Prometheus-style bucket counts, count and sum, for export
+- the last ``RECENT_SAMPLES`` durations, from which ``summary()`` reports
+  p50/p95/p99
+
+Names are ``tool:<tool name>`` for sidebar tools, ``io:<helper>`` for
+storage and credential calls and ``render:<what>`` for chart drawing.
+
+Optional exports, both off by default:
+
+- ``HEALTH_METRICS_PORT``: serve the registry as Prometheus text on
+  ``http://127.0.0.1:<port>/metrics``
+- ``HEALTH_METRICS_LOG``: append one JSON line per finished span to this file
+
+``capture_profile(session_state)`` runs cProfile around one rerun when the
+admin Performance panel asked for it.
+"""
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_PORT = os.environ.get("HEALTH_METRICS_PORT")
+METRICS_LOG = os.environ.get("HEALTH_METRICS_LOG")
+RECENT_SAMPLES = 2048
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROFILE_LINES = 40
+
+log = logging.getLogger(__name__)
+
+
+class _Histogram:
+    __slots__ = ("count", "total", "buckets", "recent")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # last bucket is +Inf
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+
+def _percentile(ordered, q):
+    return ordered[min(int(q / 100 * len(ordered)), len(ordered) - 1)]
+
+
+class Registry:
+    def __init__(self, log_path=METRICS_LOG):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._log_path = log_path
+        # The log has its own lock and a handle kept open for the process, so
+        # spans never wait on file I/O while holding the registry lock.
+        self._log_lock = threading.Lock()
+        self._log_file = None
+
+    def observe(self, name, seconds):
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = _Histogram()
+            hist.count += 1
+            hist.total += seconds
+            hist.buckets[bisect_left(BUCKETS, seconds)] += 1
+            hist.recent.append(seconds)
+        if self._log_path:
+            self._write_log(json.dumps({"span": name, "seconds": seconds, "at": time.time()}) + "\n")
+
+    def _write_log(self, line):
+        with self._log_lock:
+            if self._log_file is None:
+                if not self._log_path:  # opening failed earlier
+                    return
+                try:
+                    self._log_file = open(self._log_path, "a", encoding="utf-8", buffering=1)
+                except OSError as exc:
+                    log.warning("Metrics log %s not written: %s", self._log_path, exc)
+                    self._log_path = None
+                    return
+            self._log_file.write(line)
+
+    def summary(self):
+        """``{name: {count, mean_ms, p50_ms, p95_ms, p99_ms}}``, from recent samples."""
+        with self._lock:
+            snapshot = {name: (hist.count, hist.total, sorted(hist.recent)) for name, hist in self._histograms.items()}
+        result = {}
+        for name, (count, total, ordered) in sorted(snapshot.items()):
+            result[name] = {
+                "count": count,
+                "mean_ms": 1000 * total / count,
+                **{f"p{q}_ms": 1000 * _percentile(ordered, q) for q in (50, 95, 99)},
+            }
+        return result
+
+    def prometheus_text(self):
+        lines = [
+            "# HELP health_span_seconds Wall time of instrumented dashboard spans.",
+            "# TYPE health_span_seconds histogram",
+        ]
+        with self._lock:
+            for name, hist in sorted(self._histograms.items()):
+                label = name.replace("\\", "\\\\").replace('"', '\\"')
+                cumulative = 0
+                for bound, n in zip(BUCKETS + ("+Inf",), hist.buckets):
+                    cumulative += n
+                    lines.append(f'health_span_seconds_bucket{{span="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'health_span_seconds_sum{{span="{label}"}} {hist.total}')
+                lines.append(f'health_span_seconds_count{{span="{label}"}} {hist.count}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+registry = Registry()
+
+
+@contextmanager
+def span(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe(name, time.perf_counter() - start)
+
+
+def timed(name):
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# ---------- Prometheus endpoint ----------
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_failed = False
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=METRICS_PORT):
+    """Serve /metrics on localhost once per process, if a port is configured.
+
+    If the port is taken (e.g. by another server process) this warns once and
+    returns None on every later call.
+    """
+    global _server, _server_failed
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None and not _server_failed:
+            try:
+                _server = ThreadingHTTPServer(("127.0.0.1", int(port)), _MetricsHandler)
+            except OSError as exc:
+                _server_failed = True
+                log.warning("Metrics server not started on port %s: %s", port, exc)
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        return _server
+
+
+# ---------- cProfile capture ----------
+@contextmanager
+def capture_profile(session_state):
+    """Profile this block if ``session_state.profile_next_rerun`` is set.
+
+    The report (top ``PROFILE_LINES`` by cumulative time) is left in
+    ``session_state.profile_report`` and the flag is cleared.
+    """
+    if not session_state.get("profile_next_rerun"):
+        yield
+        return
+    session_state.profile_next_rerun = False
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # another session is profiling (one profiler at a time on 3.12+)
+        session_state.profile_report = "Another rerun was being profiled; try again."
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_LINES)
+        session_state.profile_report = out.getvalue()
@@ -0,0 +1,53 @@
+"""Advisory inter-process file locks.
+
+``file_lock(path)`` holds an exclusive lock on ``path + ".lock"`` for the
+duration of the ``with`` block. It uses ``fcntl.flock`` on POSIX and
+``msvcrt.locking`` on Windows. Locks are advisory: they only serialize
+writers that also take them.
+
+``transaction(conn)`` runs the block as one SQLite write transaction on a
+connection opened with ``isolation_level=None``: ``BEGIN IMMEDIATE`` takes the
+database's write lock up front, and the block is committed, or rolled back if
+it raises.
+"""
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path):
+    lock_path = f"{path}.lock"
+    directory = os.path.dirname(lock_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(lock_path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def transaction(conn):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
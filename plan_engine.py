@@ -0,0 +1,201 @@
+"""Personalized exercise and diet plans from a data-driven template catalog.
+
+A catalog row is keyed by (goal, diet type, calorie band, age band), with
+``"*"`` allowed as a wildcard in any key column, plus ``exercise`` and
+``diet`` markdown that may use ``{target_calories}``. The built-in catalog is
+generated from the base plans in plans.py: one row for every key combination.
+Rows of a custom catalog (``HEALTH_PLAN_CATALOG``, CSV) take precedence over
+built-in ones, wildcards included; a custom row that leaves ``exercise`` or
+``diet`` blank keeps the built-in text for that part.
+
+``PlanEngine`` loads the catalog once and resolves every possible key to its
+template (exercise and diet text) up front, so matching a member is a band
+lookup plus one dict probe. Rendered markdown is memoized per (template,
+target calories rounded to ``CALORIE_STEP``) in a bounded LRU. ``plan_batch()``
+does the same for a whole member table at once (see batch_cli.py).
+"""
+import os
+import threading
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from plans import DIET_PLANS, DIET_TYPES, EXERCISE_PLANS, FITNESS_GOALS
+
+PLAN_CATALOG = os.environ.get("HEALTH_PLAN_CATALOG")
+RENDER_CACHE_SIZE = 1024
+CALORIE_STEP = 50
+DEFAULT_GOAL = "General Fitness"
+DEFAULT_DIET_TYPE = "non-vegan"
+KEY_COLUMNS = ["goal", "diet_type", "calorie_band", "age_band"]
+PLAN_COLUMNS = ["exercise", "diet"]
+
+CALORIE_EDGES = [1600, 2000, 2400, 2800]
+CALORIE_BANDS = ["<1600", "1600-1999", "2000-2399", "2400-2799", "2800+"]
+AGE_EDGES = [18, 30, 45, 60]
+AGE_BANDS = ["<18", "18-29", "30-44", "45-59", "60+"]
+
+GOAL_CALORIE_FACTOR = {"Weight Loss": 0.85, "Muscle Gain": 1.10}
+
+AGE_NOTES = {
+    "<18": "- **Age note:** Keep it playful: sports, cycling, body-weight moves; no max lifts.",
+    "18-29": "- **Progression:** Add a little intensity or load every week.",
+    "30-44": "- **Progression:** Add load every 2 weeks and keep one mobility session.",
+    "45-59": "- **Joint care:** Prefer low-impact cardio and warm up for 10 minutes.",
+    "60+": "- **Safety:** Add balance work 2x/week; check with your doctor before intense training.",
+}
+CALORIE_NOTES = {
+    "<1600": "- **Portions:** Small plates; fill half with vegetables and keep protein at every meal.",
+    "1600-1999": "- **Portions:** One cup of rice or two rotis per main meal.",
+    "2000-2399": "- **Portions:** Add a mid-morning snack such as fruit, buttermilk or sundal.",
+    "2400-2799": "- **Portions:** Three meals plus two snacks; add nuts or curd.",
+    "2800+": "- **Portions:** Three meals plus three snacks; extra millets, pulses and dairy.",
+}
+
+
+def _band(edges, labels, value):
+    return labels[bisect_right(edges, value)]
+
+
+def calorie_band(calories):
+    return _band(CALORIE_EDGES, CALORIE_BANDS, calories)
+
+
+def age_band(age):
+    return _band(AGE_EDGES, AGE_BANDS, age)
+
+
+def builtin_catalog():
+    rows = []
+    for goal, diet_type, cal, age in product(FITNESS_GOALS, DIET_TYPES, CALORIE_BANDS, AGE_BANDS):
+        exercise = EXERCISE_PLANS[goal].rstrip() + "\n                " + AGE_NOTES[age] + "\n"
+        diet = (DIET_PLANS[diet_type].rstrip()
+                + "\n                    - **Daily target:** about {target_calories} kcal"
+                + "\n                    " + CALORIE_NOTES[cal] + "\n")
+        rows.append((goal, diet_type, cal, age, exercise, diet))
+    return pd.DataFrame(rows, columns=KEY_COLUMNS + PLAN_COLUMNS)
+
+
+class PlanEngine:
+    def __init__(self, catalog, overrides=None):
+        """``overrides`` rows (a custom catalog) win over any ``catalog`` row.
+
+        Among rows of the same source the most specific wins, then the later
+        one. A blank exercise or diet cell falls back to the next matching row.
+        """
+        frames = [catalog.assign(override=False)]
+        if overrides is not None:
+            frames.append(overrides.assign(override=True))
+        catalog = pd.concat(frames, ignore_index=True)
+        catalog[KEY_COLUMNS] = catalog[KEY_COLUMNS].fillna("*")
+        texts = {column: [text if isinstance(text, str) and text.strip() else None for text in catalog[column]]
+                 for column in PLAN_COLUMNS}
+        candidates = {}  # concrete key -> [(override, specificity, row order)]
+        keys = list(product(FITNESS_GOALS, DIET_TYPES, CALORIE_BANDS, AGE_BANDS))
+        for row_id, (row, override) in enumerate(zip(catalog[KEY_COLUMNS].itertuples(index=False),
+                                                     catalog["override"])):
+            rank = (override, sum(value != "*" for value in row), row_id)
+            for key in keys:
+                if all(value in ("*", part) for value, part in zip(row, key)):
+                    candidates.setdefault(key, []).append(rank)
+
+        # A template is one (exercise row, diet row) pair; most keys share a few.
+        self.templates = []
+        template_ids = {}
+        self._index = {}
+        for key in keys:
+            ranks = sorted(candidates.get(key, []), reverse=True)
+            rows = tuple(next((row_id for *_, row_id in ranks if texts[column][row_id]), None)
+                         for column in PLAN_COLUMNS)
+            if None in rows:
+                raise ValueError(f"Plan catalog has no complete template for {key}")
+            if rows not in template_ids:
+                template_ids[rows] = len(self.templates)
+                self.templates.append({column: texts[column][row_id] for column, row_id in zip(PLAN_COLUMNS, rows)})
+            self._index[key] = template_ids[rows]
+        # The same mapping as a dense array, for vectorized lookups.
+        self._index_array = np.array([self._index[key] for key in keys]).reshape(
+            len(FITNESS_GOALS), len(DIET_TYPES), len(CALORIE_BANDS), len(AGE_BANDS))
+        self._render = lru_cache(maxsize=RENDER_CACHE_SIZE)(self._render_uncached)
+
+    def __len__(self):
+        return len(self.templates)
+
+    @staticmethod
+    def target_calories(goal, calories):
+        target = calories * GOAL_CALORIE_FACTOR.get(goal, 1.0)
+        return int(round(target / CALORIE_STEP) * CALORIE_STEP)
+
+    def match(self, goal, diet_type, calories, age):
+        """Template id for a member; unknown goals and diet types use the defaults."""
+        goal = goal if goal in EXERCISE_PLANS else DEFAULT_GOAL
+        diet_type = diet_type if diet_type in DIET_PLANS else DEFAULT_DIET_TYPE
+        return self._index[(goal, diet_type, calorie_band(calories), age_band(age))]
+
+    def _render_uncached(self, template_id, target_calories):
+        template = self.templates[template_id]
+        return (template["exercise"].format(target_calories=target_calories),
+                template["diet"].format(target_calories=target_calories))
+
+    def render(self, template_id, target_calories):
+        """``(exercise_markdown, diet_markdown)``, memoized."""
+        return self._render(template_id, target_calories)
+
+    def cache_info(self):
+        return self._render.cache_info()
+
+    def plan(self, goal, diet_type, calories, age):
+        template_id = self.match(goal, diet_type, calories, age)
+        exercise, diet = self.render(template_id, self.target_calories(goal, calories))
+        return {"plan_id": template_id, "exercise": exercise, "diet": diet}
+
+    def plan_batch(self, members, text=False):
+        """Plans for a member table with ``goal``, ``diet_type``, ``calories`` and ``age``.
+
+        Returns ``plan_id`` and ``target_calories`` columns (nullable where
+        calories or age are missing), plus ``exercise``/``diet`` markdown when
+        ``text`` is set. Each distinct (template, target) is rendered once.
+        """
+        goal = members["goal"].where(members["goal"].isin(list(EXERCISE_PLANS)), DEFAULT_GOAL)
+        diet_type = members["diet_type"].where(members["diet_type"].isin(list(DIET_PLANS)), DEFAULT_DIET_TYPE)
+        calories = pd.to_numeric(members["calories"], errors="coerce")
+        age = pd.to_numeric(members["age"], errors="coerce")
+        known = calories.notna() & age.notna()
+
+        plan_id = pd.Series(self._index_array[
+            pd.Categorical(goal, categories=FITNESS_GOALS).codes,
+            pd.Categorical(diet_type, categories=DIET_TYPES).codes,
+            np.searchsorted(CALORIE_EDGES, calories.fillna(0), side="right"),
+            np.searchsorted(AGE_EDGES, age.fillna(0), side="right"),
+        ], index=members.index)
+        factor = goal.map(GOAL_CALORIE_FACTOR).fillna(1.0)
+        target = (calories * factor / CALORIE_STEP).round() * CALORIE_STEP
+
+        out = pd.DataFrame({
+            "plan_id": plan_id.where(known).astype("Int64"),
+            "target_calories": target.where(known).astype("Int64"),
+        }, index=members.index)
+        if text:
+            pairs = pd.Series(list(zip(out["plan_id"], out["target_calories"])), index=members.index)
+            codes, uniques = pd.factorize(pairs)
+            rendered = [(None, None) if pd.isna(tid) else self.render(int(tid), int(cal)) for tid, cal in uniques]
+            out["exercise"] = pd.Series([rendered[c][0] for c in codes], index=members.index, dtype="string")
+            out["diet"] = pd.Series([rendered[c][1] for c in codes], index=members.index, dtype="string")
+        return out
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_plan_engine():
+    """Load the catalog on first use and share the engine across sessions."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            overrides = pd.read_csv(PLAN_CATALOG, dtype=str) if PLAN_CATALOG else None
+            _engine = PlanEngine(builtin_catalog(), overrides)
+        return _engine
@@ -0,0 +1,62 @@
+"""Daily reset and deadlines for the Wellness Planner.
+
+Completion ticks reset once a day. Instead of checking on every rerun, the
+``DailyResetScheduler`` issues one bulk ``reset_daily`` per user per day to
+the storage backend and remembers, per process, the day it last did so.
+
+A task's deadline is stored when it is added (``timestamp + duration``), and
+``time_left()`` works out the countdown for a whole task table in one
+vectorized pass. Tasks saved before deadlines were stored fall back to the old
+fixed ``LEGACY_DURATION``.
+"""
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+LEGACY_DURATION = timedelta(minutes=30)
+
+
+class DailyResetScheduler:
+    def __init__(self):
+        self._last_reset = {}  # username -> ISO date of the last reset
+        self._lock = threading.Lock()
+
+    def ensure_reset(self, storage, username, now=None):
+        """Reset ``username``'s ticks if that hasn't happened yet today.
+
+        Returns True when the backend actually changed any rows.
+        """
+        now = now or datetime.now()
+        today = now.date().isoformat()
+        with self._lock:
+            if self._last_reset.get(username) == today:
+                return False
+        # Marked done only once the reset succeeded, so a failure is retried on
+        # the next rerun. Two sessions racing here both reset, which is harmless.
+        changed = storage.reset_daily(username, today, now.isoformat())
+        with self._lock:
+            self._last_reset[username] = today
+        return changed
+
+
+scheduler = DailyResetScheduler()
+
+
+def deadline_for(start, minutes):
+    return (start + timedelta(minutes=int(minutes))).isoformat()
+
+
+def time_left(tasks, now=None):
+    """``(labels, overdue)`` Series aligned with ``tasks``.
+
+    Labels are countdowns as the planner always showed them (``0 days
+    00:29:59``); ``overdue`` marks tasks past their deadline.
+    """
+    now = pd.Timestamp(now or datetime.now())
+    deadline = pd.to_datetime(tasks["deadline"].replace("", None), errors="coerce", format="ISO8601")
+    started = pd.to_datetime(tasks["timestamp"], errors="coerce", format="ISO8601")
+    remaining = deadline.fillna(started + LEGACY_DURATION) - now
+    overdue = ~(remaining.dt.total_seconds() > 0)
+    labels = remaining.astype(str).str.split(".").str[0]
+    return labels, overdue
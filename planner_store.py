@@ -0,0 +1,149 @@
+"""Sharded, lock-protected per-user CSV files (planner tasks and badges).
+
+Files live under ``<root>/<h[0:2]>/<h[2:4]>/<prefix>_<username>.csv``, where
+``h`` is the SHA-1 of the username, so no directory holds more than a small
+slice of users. Every write is read-modify-write under an advisory lock on the
+file (``locking.file_lock``) and lands atomically via a temp file and
+``os.replace``; append-only logs use ``append()`` instead. Two tabs of the same user can't interleave half-written files
+or drop each other's changes. Reads go through a bounded per-process LRU cache
+(``CACHE_ENTRIES`` files), validated against the file's (inode, mtime, size)
+stamp; bulk scans (``modified_since()``) bypass it.
+
+A flat ``<prefix>_<username>.csv`` left in ``legacy_root`` from the old layout
+is moved into its shard on first access.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from urllib.parse import quote, unquote
+
+import pandas as pd
+
+from locking import file_lock
+
+CACHE_ENTRIES = 1024
+
+
+class ShardedCsvStore:
+    def __init__(self, root, prefix, columns, legacy_root=None):
+        self.root = root
+        self.prefix = prefix
+        self.columns = columns
+        self.legacy_root = legacy_root
+        self._cache = OrderedDict()  # path -> ((inode, mtime_ns, size), DataFrame), LRU order
+        self._cache_lock = threading.Lock()
+
+    def path(self, username):
+        digest = hashlib.sha1(username.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, digest[:2], digest[2:4], f"{self.prefix}_{quote(username, safe='')}.csv")
+
+    def _legacy_path(self, username):
+        return os.path.join(self.legacy_root, f"{self.prefix}_{username}.csv")
+
+    def _migrate_legacy(self, username, path):
+        if self.legacy_root is None or os.path.exists(path):
+            return
+        legacy = self._legacy_path(username)
+        if os.path.exists(legacy):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(legacy, path)
+
+    def _load(self, path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return pd.DataFrame(columns=self.columns)
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._cache_lock:
+            cached = self._cache.get(path)
+            if cached is not None:
+                self._cache.move_to_end(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1].copy()
+        df = self._read_file(path)
+        self._cache_put(path, stamp, df)
+        return df.copy()
+
+    def _read_file(self, path):
+        df = pd.read_csv(path)
+        for col in self.columns:
+            if col not in df.columns:
+                df[col] = ""
+        return df
+
+    def _cache_put(self, path, stamp, df):
+        with self._cache_lock:
+            self._cache[path] = (stamp, df)
+            self._cache.move_to_end(path)
+            while len(self._cache) > CACHE_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def _write_atomic(self, path, df):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".csv")
+        try:
+            with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+                df.to_csv(f, index=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        st = os.stat(path)
+        self._cache_put(path, (st.st_ino, st.st_mtime_ns, st.st_size), df.copy())
+
+    def read(self, username):
+        """The user's rows; a user without data gets an empty frame and no files."""
+        path = self.path(username)
+        if (not os.path.exists(path) and self.legacy_root is not None
+                and os.path.exists(self._legacy_path(username))):
+            with file_lock(path):
+                self._migrate_legacy(username, path)
+        return self._load(path)
+
+    def update(self, username, fn):
+        """Apply ``fn(current_df) -> new_df`` under the file lock and persist it.
+
+        ``fn`` may return ``None`` to leave the file untouched.
+        """
+        path = self.path(username)
+        with file_lock(path):
+            self._migrate_legacy(username, path)
+            df = fn(self._load(path))
+            if df is not None:
+                self._write_atomic(path, df.reset_index(drop=True))
+            return df
+
+    def write(self, username, df):
+        return self.update(username, lambda _: df)
+
+    def modified_since(self, since_epoch=0.0):
+        """``(username, df)`` for every file modified at or after ``since_epoch``.
+
+        Files are read one at a time and not cached, so a full scan doesn't
+        leave every user's rows in memory.
+        """
+        head, tail = f"{self.prefix}_", ".csv"
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if not (name.startswith(head) and name.endswith(tail)):
+                    continue
+                path = os.path.join(directory, name)
+                if os.stat(path).st_mtime >= since_epoch:
+                    yield unquote(name[len(head):-len(tail)]), self._read_file(path)
+
+    def append(self, username, df):
+        """Append rows in place, without rewriting the file (for logs)."""
+        path = self.path(username)
+        with file_lock(path):
+            self._migrate_legacy(username, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            new_file = not os.path.exists(path)
+            with open(path, "a", newline="", encoding="utf-8") as f:
+                df[self.columns].to_csv(f, index=False, header=new_file)
+                f.flush()
+                os.fsync(f.fileno())
@@ -0,0 +1,42 @@
+"""Exercise and diet plan text shared by the UI and the batch CLI."""
+
+FITNESS_GOALS = ["Weight Loss", "Muscle Gain", "General Fitness", "Flexibility & Stress Relief"]
+DIET_TYPES = ["non-vegan", "vegan"]
+
+EXERCISE_PLANS = {
+    "Weight Loss": """
+                - **Cardio:** 5 days/week — 30 to 45 minutes/session  
+                - **Strength Training:** 2–3 days/week  
+                - **Diet Tip:** Stay in calorie deficit.  
+                - **Recovery:** 7–8 hours sleep, hydration (2.5–3 L/day)  
+                """,
+    "Muscle Gain": """
+                - **Strength Training:** 4–5 days/week  
+                - **Protein Intake:** Include dal, paneer, eggs, chicken, sprouts  
+                - **Rest & Recovery:** Sleep 8 hrs/night  
+                - **Cardio:** Light cardio 2x/week  
+                """,
+    "General Fitness": """
+                - **Routine Mix:** Cardio + strength + flexibility (3–4x/week)  
+                - **Examples:** Walking, yoga, home circuits  
+                - **Diet:** Whole grains, local veggies, pulses  
+                """,
+    "Flexibility & Stress Relief": """
+                - **Yoga & Stretching:** 4–5x/week  
+                - **Breathing & Meditation:** Daily  
+                - **Supplemental:** Walks, music meditation  
+                """,
+}
+
+DIET_PLANS = {
+    "non-vegan": """
+                    - **Breakfast:** Boiled egg with poha, Banana with milk
+                    - **Lunch:** Fish gravy with rice, Chicken curry with roti
+                    - **Dinner:** Fish fry with chapati, Egg masala with jowar roti
+                    """,
+    "vegan": """
+                    - **Breakfast:** Millet dosa with coconut chutney, Salad with toasted paneer
+                    - **Lunch:** Roti with paneer & mushroom curry, Brown rice with dal
+                    - **Dinner:** Steamed vegetables and nuts, Salad with channa, rajma, sprouts
+                    """,
+}
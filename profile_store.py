@@ -0,0 +1,88 @@
+"""Per-user profile and score state shared by every server process.
+
+Streamlit keeps ``st.session_state`` per browser session inside one server
+process, so with several processes behind a load balancer a user who lands on
+another process starts from scratch. The ``Profile`` here holds what the tools
+would otherwise ask for again (age, gender, height, weight, diet type, goal)
+plus the session's scores and selected symptoms. It lives in a small WAL-mode
+SQLite database (``HEALTH_PROFILE_PATH``) that any number of processes can
+read concurrently without blocking the writer.
+
+A profile is stored as one compact row: a JSON array of the field values in
+declaration order, prefixed by a format version. Writes that change nothing
+are skipped.
+"""
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import astuple, dataclass, fields, replace
+
+from locking import transaction
+
+PROFILE_PATH = os.environ.get("HEALTH_PROFILE_PATH", "profiles.db")
+FORMAT_VERSION = 1
+
+
+@dataclass(slots=True)
+class Profile:
+    age: int | None = None
+    gender: str | None = None
+    height: str = ""
+    weight: float | None = None
+    diet_type: str | None = None
+    goal: str | None = None
+    nutrition_score: int = 0
+    exercise_score: int = 0
+    selected_symptoms: tuple = ()
+
+    def dumps(self):
+        return json.dumps([FORMAT_VERSION, *astuple(self)], separators=(",", ":"))
+
+    @classmethod
+    def loads(cls, data):
+        _version, *values = json.loads(data)
+        # Rows written by an older format simply lack the newer trailing fields.
+        profile = cls(*values[:len(fields(cls))])
+        profile.selected_symptoms = tuple(profile.selected_symptoms)
+        return profile
+
+
+class ProfileStore:
+    def __init__(self, path=PROFILE_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS profiles (username TEXT PRIMARY KEY, data TEXT NOT NULL) WITHOUT ROWID"
+        )
+
+    def load(self, username):
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM profiles WHERE username = ?", (username,)).fetchone()
+        return Profile.loads(row[0]) if row else Profile()
+
+    def update(self, username, **changes):
+        """Merge ``changes`` into the stored profile; returns the result."""
+        if "selected_symptoms" in changes:
+            changes["selected_symptoms"] = tuple(changes["selected_symptoms"])
+        with self._lock, transaction(self._conn):
+            row = self._conn.execute("SELECT data FROM profiles WHERE username = ?", (username,)).fetchone()
+            current = Profile.loads(row[0]) if row else Profile()
+            profile = replace(current, **changes)
+            if row is None or profile != current:
+                self._conn.execute("INSERT OR REPLACE INTO profiles VALUES (?, ?)", (username, profile.dumps()))
+        return profile
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_profile_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ProfileStore()
+        return _store
@@ -0,0 +1,158 @@
+"""Incremental population analytics over wellness scores.
+
+Each recorded score goes to the user's append-only series in the storage
+backend and is folded into running aggregates held in a small WAL-mode SQLite
+database (``HEALTH_ANALYTICS_PATH``):
+
+- ``daily``: per-day count and component sums, from which the means come
+- ``histogram``: per-day counts of each total score. Totals are integers in
+  0..100, so this 101-bin histogram is an exact streaming sketch and
+  percentiles are read off its cumulative counts.
+- ``user_rolling``: per-user count, EWMA, and the last ``ROLLING_WINDOW``
+  totals for a rolling mean
+
+Updating the aggregates costs three row upserts per score, and queries read at
+most one row per day (plus 101 bins per day for percentiles), however long the
+history gets.
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from locking import transaction
+from storage import get_storage
+
+ANALYTICS_PATH = os.environ.get("HEALTH_ANALYTICS_PATH", "score_analytics.db")
+ROLLING_WINDOW = 7
+EWMA_ALPHA = 0.3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily (
+    day TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    sum_symptom INTEGER NOT NULL,
+    sum_nutrition INTEGER NOT NULL,
+    sum_exercise INTEGER NOT NULL,
+    sum_total INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS histogram (
+    day TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, score)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS user_rolling (
+    username TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    ewma REAL NOT NULL,
+    recent TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class ScoreAnalytics:
+    def __init__(self, path=ANALYTICS_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def update(self, username, symptom, nutrition, exercise, timestamp):
+        """Fold one score into the aggregates."""
+        total = symptom + nutrition + exercise
+        day = timestamp[:10]
+        with self._lock, transaction(self._conn):
+            self._conn.execute(
+                """INSERT INTO daily VALUES (?, 1, ?, ?, ?, ?)
+                   ON CONFLICT (day) DO UPDATE SET
+                       count = count + 1, sum_symptom = sum_symptom + excluded.sum_symptom,
+                       sum_nutrition = sum_nutrition + excluded.sum_nutrition,
+                       sum_exercise = sum_exercise + excluded.sum_exercise,
+                       sum_total = sum_total + excluded.sum_total""",
+                (day, symptom, nutrition, exercise, total),
+            )
+            self._conn.execute(
+                "INSERT INTO histogram VALUES (?, ?, 1) "
+                "ON CONFLICT (day, score) DO UPDATE SET count = count + 1",
+                (day, total),
+            )
+            row = self._conn.execute(
+                "SELECT count, ewma, recent FROM user_rolling WHERE username = ?", (username,)
+            ).fetchone()
+            if row is None:
+                count, ewma, recent = 1, float(total), [total]
+            else:
+                count = row[0] + 1
+                ewma = EWMA_ALPHA * total + (1 - EWMA_ALPHA) * row[1]
+                recent = ([int(v) for v in row[2].split(",")] + [total])[-ROLLING_WINDOW:]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO user_rolling VALUES (?, ?, ?, ?)",
+                (username, count, ewma, ",".join(map(str, recent))),
+            )
+
+    # ---------- Queries ----------
+    def daily_means(self, start=None, end=None):
+        rows = self._query(
+            """SELECT day, count, 1.0 * sum_symptom / count, 1.0 * sum_nutrition / count,
+                      1.0 * sum_exercise / count, 1.0 * sum_total / count
+               FROM daily WHERE day >= ? AND day <= ? ORDER BY day""",
+            (start or "", end or "9999"),
+        )
+        return pd.DataFrame(rows, columns=["day", "count", "symptom", "nutrition", "exercise", "total"])
+
+    def percentiles(self, quantiles=(50, 90, 99), start=None, end=None):
+        """Percentiles of the total score over a day range, from the histogram."""
+        rows = self._query(
+            "SELECT score, SUM(count) FROM histogram WHERE day >= ? AND day <= ? GROUP BY score ORDER BY score",
+            (start or "", end or "9999"),
+        )
+        n = sum(count for _, count in rows)
+        if not n:
+            return {}
+        result = {}
+        for q in quantiles:
+            rank = q / 100 * n
+            seen = 0
+            for score, count in rows:
+                seen += count
+                if seen >= rank:
+                    result[q] = score
+                    break
+        return result
+
+    def user_summary(self, username):
+        row = self._query("SELECT count, ewma, recent FROM user_rolling WHERE username = ?", (username,))
+        if not row:
+            return None
+        count, ewma, recent = row[0]
+        recent = [int(v) for v in recent.split(",")]
+        return {"count": count, "ewma": ewma, "rolling_mean": sum(recent) / len(recent)}
+
+
+_analytics = None
+_analytics_lock = threading.Lock()
+
+
+def get_analytics():
+    global _analytics
+    with _analytics_lock:
+        if _analytics is None:
+            _analytics = ScoreAnalytics()
+        return _analytics
+
+
+def record_scores(username, symptom, nutrition, exercise, timestamp=None):
+    """Append one score to the user's series and update the aggregates."""
+    timestamp = timestamp or datetime.now().isoformat()
+    record = {"timestamp": timestamp, "symptom": int(symptom),
+              "nutrition": int(nutrition), "exercise": int(exercise)}
+    get_storage().append_score(username, record)
+    get_analytics().update(username, record["symptom"], record["nutrition"], record["exercise"], timestamp)
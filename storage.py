@@ -0,0 +1,611 @@
+"""Storage backends for users, planner tasks, badges, wellness scores and feedback.
+
+``CsvStorage`` keeps users.csv, per-user planner/badge/completion CSVs sharded under
+planner/ (see planner_store.py) and the segmented feedback log in feedback/
+(see feedback_log.py). ``SqliteStorage`` keeps the same data in indexed tables
+of one WAL-mode database and writes only the rows that changed. Pick one with
+the ``HEALTH_STORAGE_BACKEND`` environment variable ("csv" or "sqlite");
+``get_storage()`` returns the process-wide instance.
+
+Switching an existing install from CSV to SQLite: accounts are carried over
+automatically, since ``SqliteStorage`` adopts users.csv into an empty users
+table. Tasks, badges, scores and feedback are moved by exporting from the CSV
+backend and importing into the SQLite one (see health_export.py).
+"""
+import csv
+import io
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from urllib.parse import quote, unquote
+
+import pandas as pd
+
+from feedback_log import FEEDBACK_COLUMNS, FEEDBACK_DIR, LEGACY_FEEDBACK_FILE, FeedbackLog
+from locking import file_lock, transaction
+from planner_store import ShardedCsvStore
+from user_store import get_user_store
+
+TASK_COLUMNS = ["task", "completed", "timestamp", "last_updated", "deadline"]
+BADGE_COLUMNS = ["badge", "date"]
+SCORE_COLUMNS = ["timestamp", "symptom", "nutrition", "exercise"]
+# Columns per dataset in export_rows()/import_rows(), and the timestamp column
+# that says when a row last changed.
+EXPORT_COLUMNS = {
+    "tasks": ["username", "task_id"] + TASK_COLUMNS,
+    "badges": ["username"] + BADGE_COLUMNS,
+    "scores": ["username"] + SCORE_COLUMNS,
+    "feedback": FEEDBACK_COLUMNS,
+}
+CHANGE_COLUMNS = {"tasks": "last_updated", "badges": "date", "scores": "timestamp", "feedback": "Timestamp"}
+COMPLETION_COLUMNS = ["timestamp", "task_id", "task", "category"]
+
+USERS_FILE = "users.csv"
+PLANNER_DIR = "planner"
+
+STORAGE_BACKEND = os.environ.get("HEALTH_STORAGE_BACKEND", "csv")
+SQLITE_PATH = os.environ.get("HEALTH_SQLITE_PATH", "health_calc.db")
+
+
+def _normalize_tasks(df):
+    for col in TASK_COLUMNS:
+        if col not in df.columns:
+            df[col] = "" if col != "completed" else False
+    return df[TASK_COLUMNS]
+
+
+def _tail_csv(path, limit, block=64 * 1024):
+    """The last ``limit`` rows of a CSV file, read backwards from its end."""
+    with open(path, "rb") as f:
+        header = f.readline()
+        body_start = f.tell()
+        pos = f.seek(0, os.SEEK_END)
+        data = b""
+        while pos > body_start and data.count(b"\n") <= limit:
+            step = min(block, pos - body_start)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.splitlines(keepends=True)
+    if pos > body_start:
+        lines = lines[1:]  # may start mid-row
+    return pd.read_csv(io.BytesIO(header + b"".join(lines[-limit:])))
+
+
+# ---------- CSV backend ----------
+class CsvStorage:
+    def __init__(self, root="."):
+        self.root = root
+        self.users_file = os.path.join(root, USERS_FILE)
+        self.tasks = ShardedCsvStore(os.path.join(root, PLANNER_DIR), "planner", TASK_COLUMNS, legacy_root=root)
+        self.badges = ShardedCsvStore(os.path.join(root, PLANNER_DIR), "badges", BADGE_COLUMNS, legacy_root=root)
+        self.completions = ShardedCsvStore(os.path.join(root, PLANNER_DIR), "completions", COMPLETION_COLUMNS)
+        self.badge_state = ShardedCsvStore(os.path.join(root, PLANNER_DIR), "badge_state", ["state"])
+        self._feedback_log = None
+        self._feedback_lock = threading.Lock()
+
+    def _score_file(self, username):
+        # Escaped like the planner shards, so no username can leave scores/.
+        path = os.path.join(self.root, "scores", f"scores_{quote(username, safe='')}.csv")
+        legacy = os.path.join(self.root, "scores", f"scores_{username}.csv")
+        if (legacy != path and os.path.dirname(legacy) == os.path.dirname(path)
+                and not os.path.exists(path) and os.path.exists(legacy)):
+            os.replace(legacy, path)  # written before names were escaped
+        return path
+
+    # Users
+    def get_password_hash(self, username):
+        return get_user_store(self.users_file).get_password_hash(username)
+
+    def user_exists(self, username):
+        return get_user_store(self.users_file).exists(username)
+
+    def users_valid(self):
+        return get_user_store(self.users_file).is_valid()
+
+    def add_user(self, username, password_hash):
+        get_user_store(self.users_file).add(username, password_hash)
+
+    def update_password(self, username, password_hash):
+        get_user_store(self.users_file).update(username, password_hash)
+
+    # Planner
+    # Every write re-reads the current file under its lock, so edits from
+    # another tab or server process that landed since our load are kept.
+    def load_tasks(self, username):
+        return _normalize_tasks(self.tasks.read(username))
+
+    def save_tasks(self, username, df):
+        self.tasks.write(username, df[TASK_COLUMNS])
+
+    def append_tasks(self, username, df, start):
+        new_rows = df[TASK_COLUMNS].iloc[start:]
+        self.tasks.update(username, lambda current: pd.concat(
+            [_normalize_tasks(current), new_rows], ignore_index=True))
+
+    def reset_daily(self, username, today, now):
+        """Untick every task last updated before ``today`` (an ISO date)."""
+        def apply(current):
+            current = _normalize_tasks(current)
+            stale = current["last_updated"].astype(str).str[:10] < today
+            if not stale.any():
+                return None
+            current = current.copy()
+            current.loc[stale, "completed"] = False
+            current.loc[stale, "last_updated"] = now
+            return current
+        return self.tasks.update(username, apply) is not None
+
+    def update_tasks(self, username, df, rows):
+        def apply(current):
+            current = _normalize_tasks(current).copy()
+            for pos in rows:
+                if pos < len(current):
+                    current.iloc[pos] = df[TASK_COLUMNS].iloc[pos].to_numpy()
+                else:
+                    current.loc[len(current)] = df[TASK_COLUMNS].iloc[pos].to_numpy()
+            return current
+        self.tasks.update(username, apply)
+
+    # Badges
+    def load_badges(self, username):
+        return self.badges.read(username)[BADGE_COLUMNS]
+
+    def save_badges(self, username, df):
+        self.badges.write(username, df[BADGE_COLUMNS])
+
+    def append_badges(self, username, df):
+        def apply(current):
+            new_rows = df[~df["badge"].isin(current["badge"])]
+            return pd.concat([current[BADGE_COLUMNS], new_rows[BADGE_COLUMNS]], ignore_index=True)
+        self.badges.update(username, apply)
+
+    # Completion log and badge progress
+    def append_completions(self, username, df):
+        self.completions.append(username, df)
+
+    def load_completions(self, username):
+        return self.completions.read(username)[COMPLETION_COLUMNS]
+
+    def update_badge_state(self, username, fn):
+        """Apply ``fn(state_or_None) -> state`` to the user's badge counters."""
+        def apply(current):
+            state = fn(json.loads(current["state"].iloc[0]) if len(current) else None)
+            return pd.DataFrame({"state": [json.dumps(state)]})
+        return json.loads(self.badge_state.update(username, apply)["state"].iloc[0])
+
+    # Wellness scores (append-only)
+    def append_score(self, username, record):
+        file = self._score_file(username)
+        df = pd.DataFrame([record], columns=SCORE_COLUMNS)
+        with file_lock(file):
+            df.to_csv(file, mode='a', header=not os.path.exists(file), index=False)
+
+    def load_scores(self, username, limit=None):
+        """The user's scores, oldest first; with ``limit`` only the file's tail is read."""
+        file = self._score_file(username)
+        if not os.path.exists(file):
+            return pd.DataFrame(columns=SCORE_COLUMNS)
+        with file_lock(file):
+            return _tail_csv(file, limit) if limit else pd.read_csv(file)
+
+    # Feedback
+    @property
+    def feedback_log(self):
+        with self._feedback_lock:
+            if self._feedback_log is None:
+                self._feedback_log = FeedbackLog(
+                    root=os.path.join(self.root, FEEDBACK_DIR),
+                    legacy_file=os.path.join(self.root, LEGACY_FEEDBACK_FILE),
+                )
+            return self._feedback_log
+
+    def append_feedback(self, entry):
+        self.feedback_log.submit(entry)
+
+    def flush_feedback(self):
+        self.feedback_log.flush()
+
+    def feedback_page(self, page, page_size=50):
+        return self.feedback_log.page(page, page_size)
+
+    def feedback_stats(self):
+        return self.feedback_log.stats()
+
+    def load_feedback(self):
+        return self.feedback_log.read_all()
+
+    # Export / import (see health_export.py)
+    def export_rows(self, dataset, since=""):
+        """Rows of ``dataset`` that changed after the ISO timestamp ``since``.
+
+        Per-user files not modified since then are skipped without reading.
+        """
+        column = CHANGE_COLUMNS[dataset]
+        if dataset == "feedback":
+            self.feedback_log.flush()
+            df = self.feedback_log.read_since(since)
+        else:
+            since_epoch = datetime.fromisoformat(since).timestamp() if since else 0.0
+            if dataset == "scores":
+                users = self._score_files_since(since_epoch)
+            else:
+                users = (self.tasks if dataset == "tasks" else self.badges).modified_since(since_epoch)
+            frames = []
+            for username, df in users:
+                df = df.rename_axis("task_id").reset_index() if dataset == "tasks" else df
+                frames.append(df.assign(username=username))
+            df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=EXPORT_COLUMNS[dataset])
+        if since:
+            df = df[df[column].astype(str) > since]
+        return df[EXPORT_COLUMNS[dataset]].reset_index(drop=True)
+
+    def _score_files_since(self, since_epoch):
+        directory = os.path.join(self.root, "scores")
+        if not os.path.isdir(directory):
+            return
+        for entry in os.scandir(directory):
+            if entry.name.startswith("scores_") and entry.name.endswith(".csv") \
+                    and entry.stat().st_mtime >= since_epoch:
+                yield unquote(entry.name[len("scores_"):-len(".csv")]), pd.read_csv(entry.path)
+
+    def import_rows(self, dataset, df):
+        """Load exported rows; tasks replace the user's list, the rest append."""
+        if dataset == "feedback":
+            for entry in df[FEEDBACK_COLUMNS].to_dict("records"):
+                self.feedback_log.submit(entry)
+            self.feedback_log.flush()
+            return
+        for username, rows in df.groupby("username", sort=False):
+            if dataset == "tasks":
+                self.save_tasks(username, rows.sort_values("task_id")[TASK_COLUMNS].reset_index(drop=True))
+            elif dataset == "badges":
+                self.append_badges(username, rows[BADGE_COLUMNS])
+            else:
+                file = self._score_file(username)
+                with file_lock(file):
+                    rows[SCORE_COLUMNS].to_csv(file, mode='a', header=not os.path.exists(file), index=False)
+
+
+# ---------- SQLite backend ----------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    password TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tasks (
+    username TEXT NOT NULL,
+    task_id INTEGER NOT NULL,
+    task TEXT,
+    completed INTEGER NOT NULL DEFAULT 0,
+    timestamp TEXT,
+    last_updated TEXT,
+    deadline TEXT,
+    PRIMARY KEY (username, task_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS badges (
+    username TEXT NOT NULL,
+    badge TEXT NOT NULL,
+    date TEXT,
+    PRIMARY KEY (username, badge)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    rating INTEGER,
+    comment TEXT,
+    timestamp TEXT
+);
+CREATE INDEX IF NOT EXISTS feedback_timestamp ON feedback (timestamp);
+CREATE TABLE IF NOT EXISTS scores (
+    username TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    symptom INTEGER,
+    nutrition INTEGER,
+    exercise INTEGER
+);
+CREATE INDEX IF NOT EXISTS scores_user_time ON scores (username, timestamp);
+CREATE TABLE IF NOT EXISTS completions (
+    username TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    task_id INTEGER,
+    task TEXT,
+    category TEXT
+);
+CREATE INDEX IF NOT EXISTS completions_user_time ON completions (username, timestamp);
+CREATE TABLE IF NOT EXISTS badge_state (
+    username TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS feedback_ratings (
+    rating INTEGER PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS feedback_daily (
+    day TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class SqliteStorage:
+    def __init__(self, path=SQLITE_PATH, users_file=USERS_FILE):
+        self.path = path
+        # One connection per process, shared by every Streamlit session thread
+        # and serialized by the lock below.
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        task_columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        if "deadline" not in task_columns:
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN deadline TEXT")
+        self._backfill_feedback_aggregates()
+        self._adopt_users_file(users_file)
+
+    def _adopt_users_file(self, users_file):
+        """Copy the CSV backend's accounts into an empty users table, once."""
+        if not users_file or not os.path.exists(users_file) or self._query("SELECT 1 FROM users LIMIT 1"):
+            return
+        with open(users_file, newline="", encoding="utf-8") as f:
+            rows = [(row["username"], row["password"]) for row in csv.DictReader(f)
+                    if row.get("username") and row.get("password")]
+        # OR IGNORE: another process may be adopting the same file, and the
+        # CSV backend keeps the first row of a duplicated username.
+        self._write("INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)", rows, many=True)
+
+    def _backfill_feedback_aggregates(self):
+        """Rebuild the feedback aggregates when they don't cover the feedback
+        table, e.g. on a database that had feedback before they existed."""
+        with self._lock, transaction(self._conn):
+            stale = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM feedback) != (SELECT COALESCE(SUM(count), 0) FROM feedback_daily)"
+            ).fetchone()[0]
+            if stale:
+                self._conn.execute("DELETE FROM feedback_ratings")
+                self._conn.execute("DELETE FROM feedback_daily")
+                self._conn.execute(
+                    "INSERT INTO feedback_ratings (rating, count) "
+                    "SELECT rating, COUNT(*) FROM feedback GROUP BY rating"
+                )
+                self._conn.execute(
+                    "INSERT INTO feedback_daily (day, count) "
+                    "SELECT substr(timestamp, 1, 10), COUNT(*) FROM feedback GROUP BY 1"
+                )
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _write(self, sql, rows, many=False):
+        with self._lock, transaction(self._conn):
+            if many:
+                self._conn.executemany(sql, rows)
+            else:
+                self._conn.execute(sql, rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # Users
+    def get_password_hash(self, username):
+        rows = self._query("SELECT password FROM users WHERE username = ?", (username,))
+        return rows[0][0] if rows else None
+
+    def user_exists(self, username):
+        return self.get_password_hash(username) is not None
+
+    def users_valid(self):
+        return True
+
+    def add_user(self, username, password_hash):
+        # Like the CSV backend, a racing duplicate signup keeps the first row.
+        self._write("INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)", (username, password_hash))
+
+    def update_password(self, username, password_hash):
+        self._write("UPDATE users SET password = ? WHERE username = ?", (password_hash, username))
+
+    # Planner
+    def load_tasks(self, username):
+        rows = self._query(
+            "SELECT task, completed, timestamp, last_updated, deadline FROM tasks WHERE username = ? ORDER BY task_id",
+            (username,),
+        )
+        df = pd.DataFrame(rows, columns=TASK_COLUMNS)
+        df["completed"] = df["completed"].astype(bool)
+        return df
+
+    def _upsert_tasks(self, username, df, positions, truncate=False):
+        # Row-level upsert keyed by position; unchanged rows are left untouched
+        # by the WHERE clause.
+        values = df[TASK_COLUMNS].to_numpy()
+        rows = [
+            (username, i, str(values[i][0]), bool(values[i][1]), str(values[i][2]), str(values[i][3]),
+             None if pd.isna(values[i][4]) or values[i][4] == "" else str(values[i][4]))
+            for i in positions
+        ]
+        with self._lock, transaction(self._conn):
+            self._conn.executemany(
+                """INSERT INTO tasks (username, task_id, task, completed, timestamp, last_updated, deadline)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (username, task_id) DO UPDATE SET
+                       task = excluded.task, completed = excluded.completed,
+                       timestamp = excluded.timestamp, last_updated = excluded.last_updated,
+                       deadline = excluded.deadline
+                   WHERE task IS NOT excluded.task OR completed IS NOT excluded.completed
+                      OR timestamp IS NOT excluded.timestamp OR last_updated IS NOT excluded.last_updated
+                      OR deadline IS NOT excluded.deadline""",
+                rows,
+            )
+            if truncate:
+                self._conn.execute("DELETE FROM tasks WHERE username = ? AND task_id >= ?", (username, len(df)))
+
+    def save_tasks(self, username, df):
+        self._upsert_tasks(username, df, range(len(df)), truncate=True)
+
+    def append_tasks(self, username, df, start):
+        self._upsert_tasks(username, df, range(start, len(df)))
+
+    def update_tasks(self, username, df, rows):
+        self._upsert_tasks(username, df, rows)
+
+    def reset_daily(self, username, today, now):
+        """Untick every task last updated before ``today`` (an ISO date)."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET completed = 0, last_updated = ? WHERE username = ? AND substr(last_updated, 1, 10) < ?",
+                (now, username, today),
+            )
+            return cursor.rowcount > 0
+
+    # Badges
+    def load_badges(self, username):
+        rows = self._query("SELECT badge, date FROM badges WHERE username = ? ORDER BY date", (username,))
+        return pd.DataFrame(rows, columns=BADGE_COLUMNS)
+
+    def save_badges(self, username, df):
+        rows = [(username, badge, date) for badge, date in df[BADGE_COLUMNS].itertuples(index=False)]
+        self._write("INSERT OR IGNORE INTO badges (username, badge, date) VALUES (?, ?, ?)", rows, many=True)
+
+    def append_badges(self, username, df):
+        self.save_badges(username, df)
+
+    # Completion log and badge progress
+    def append_completions(self, username, df):
+        rows = [(username, *row) for row in df[COMPLETION_COLUMNS].itertuples(index=False)]
+        self._write(
+            "INSERT INTO completions (username, timestamp, task_id, task, category) VALUES (?, ?, ?, ?, ?)",
+            rows, many=True,
+        )
+
+    def load_completions(self, username):
+        rows = self._query(
+            "SELECT timestamp, task_id, task, category FROM completions WHERE username = ? ORDER BY timestamp",
+            (username,),
+        )
+        return pd.DataFrame(rows, columns=COMPLETION_COLUMNS)
+
+    def update_badge_state(self, username, fn):
+        """Apply ``fn(state_or_None) -> state`` to the user's badge counters."""
+        with self._lock, transaction(self._conn):
+            row = self._conn.execute("SELECT state FROM badge_state WHERE username = ?", (username,)).fetchone()
+            state = fn(json.loads(row[0]) if row else None)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO badge_state (username, state) VALUES (?, ?)",
+                (username, json.dumps(state)),
+            )
+            return state
+
+    # Wellness scores (append-only)
+    def append_score(self, username, record):
+        self._write(
+            "INSERT INTO scores (username, timestamp, symptom, nutrition, exercise) VALUES (?, ?, ?, ?, ?)",
+            (username, *(record[col] for col in SCORE_COLUMNS)),
+        )
+
+    def load_scores(self, username, limit=None):
+        rows = self._query(
+            "SELECT timestamp, symptom, nutrition, exercise FROM "
+            "(SELECT * FROM scores WHERE username = ? ORDER BY timestamp DESC LIMIT ?) ORDER BY timestamp",
+            (username, -1 if limit is None else limit),
+        )
+        return pd.DataFrame(rows, columns=SCORE_COLUMNS)
+
+    # Feedback
+    def append_feedback(self, entry):
+        # Aggregates are maintained in the same transaction as the insert so
+        # stats never need a scan of the feedback table.
+        with self._lock, transaction(self._conn):
+            self._conn.execute(
+                "INSERT INTO feedback (name, rating, comment, timestamp) VALUES (?, ?, ?, ?)",
+                tuple(entry[col] for col in FEEDBACK_COLUMNS),
+            )
+            self._conn.execute(
+                "INSERT INTO feedback_ratings (rating, count) VALUES (?, 1) "
+                "ON CONFLICT (rating) DO UPDATE SET count = count + 1",
+                (entry["Rating"],),
+            )
+            self._conn.execute(
+                "INSERT INTO feedback_daily (day, count) VALUES (?, 1) "
+                "ON CONFLICT (day) DO UPDATE SET count = count + 1",
+                (str(entry["Timestamp"])[:10],),
+            )
+
+    def flush_feedback(self):
+        pass
+
+    def feedback_page(self, page, page_size=50):
+        rows = self._query(
+            "SELECT name, rating, comment, timestamp FROM feedback ORDER BY id DESC LIMIT ? OFFSET ?",
+            (page_size, page * page_size),
+        )
+        return pd.DataFrame(rows, columns=FEEDBACK_COLUMNS)
+
+    def feedback_stats(self):
+        ratings = dict(self._query("SELECT rating, count FROM feedback_ratings"))
+        per_day = dict(self._query("SELECT day, count FROM feedback_daily ORDER BY day"))
+        return {
+            "count": sum(ratings.values()),
+            "ratings": {str(k): v for k, v in ratings.items()},
+            "per_day": per_day,
+        }
+
+    def load_feedback(self):
+        rows = self._query("SELECT name, rating, comment, timestamp FROM feedback ORDER BY id")
+        return pd.DataFrame(rows, columns=FEEDBACK_COLUMNS)
+
+    # Export / import (see health_export.py)
+    _EXPORT_SQL = {
+        "tasks": "SELECT username, task_id, task, completed, timestamp, last_updated, deadline FROM tasks "
+                 "WHERE last_updated > ? ORDER BY username, task_id",
+        "badges": "SELECT username, badge, date FROM badges WHERE date > ? ORDER BY username, date",
+        "scores": "SELECT username, timestamp, symptom, nutrition, exercise FROM scores "
+                  "WHERE timestamp > ? ORDER BY username, timestamp",
+        "feedback": "SELECT name, rating, comment, timestamp FROM feedback WHERE timestamp > ? ORDER BY id",
+    }
+
+    def export_rows(self, dataset, since=""):
+        """Rows of ``dataset`` that changed after the ISO timestamp ``since``."""
+        df = pd.DataFrame(self._query(self._EXPORT_SQL[dataset], (since,)), columns=EXPORT_COLUMNS[dataset])
+        if dataset == "tasks":
+            df["completed"] = df["completed"].astype(bool)
+        return df
+
+    def import_rows(self, dataset, df):
+        """Load exported rows; tasks replace the user's list, the rest append."""
+        if dataset == "feedback":
+            for entry in df[FEEDBACK_COLUMNS].to_dict("records"):
+                self.append_feedback(entry)
+            return
+        for username, rows in df.groupby("username", sort=False):
+            if dataset == "tasks":
+                self.save_tasks(username, rows.sort_values("task_id")[TASK_COLUMNS].reset_index(drop=True))
+            elif dataset == "badges":
+                self.save_badges(username, rows)
+            else:
+                self._write(
+                    "INSERT INTO scores (username, timestamp, symptom, nutrition, exercise) VALUES (?, ?, ?, ?, ?)",
+                    [(username, *row) for row in rows[SCORE_COLUMNS].itertuples(index=False)], many=True,
+                )
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    """Return the process-wide backend selected by HEALTH_STORAGE_BACKEND."""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            if STORAGE_BACKEND == "sqlite":
+                _storage = SqliteStorage(SQLITE_PATH)
+            elif STORAGE_BACKEND == "csv":
+                _storage = CsvStorage()
+            else:
+                raise ValueError(f"Unknown storage backend: {STORAGE_BACKEND!r}")
+        return _storage
@@ -0,0 +1,184 @@
+"""Process-wide symptom/condition index for the Symptom Checker.
+
+The source table has one row per (symptom, condition) link with optional
+``synonyms`` (";"-separated) and ``advice`` columns. Without a table file
+(``HEALTH_SYMPTOM_TABLE``, CSV) the built-in table below is used.
+
+The index is built once per process and holds:
+
+- an inverted index from symptom to the ids of its linked conditions, used by
+  ``rank()`` to score conditions by overlap with a selection
+- a sorted name list for ``bisect`` prefix search, plus a deletion-neighbourhood
+  map over name prefixes so ``search()`` also tolerates one typo
+"""
+import os
+import threading
+from bisect import bisect_left
+from collections import Counter
+
+import pandas as pd
+
+SYMPTOM_TABLE = os.environ.get("HEALTH_SYMPTOM_TABLE")
+FUZZY_PREFIX_LEN = 6
+FUZZY_MIN_LEN = 3
+
+# symptom -> (condition/cause, advice)
+BUILTIN_SYMPTOMS = {
+    "headache": ("Dehydration, stress", "Drink water, rest."),
+    "fatigue": ("Lack of sleep", "Get proper rest."),
+    "cold": ("Viral Infection", "Take rest, drink fluids."),
+    "fever": ("Infection", "Use paracetamol."),
+    "vomiting": ("Food poisoning", "Use ORS, avoid solid food."),
+    "dizziness": ("Low BP", "Sit down, drink fluids."),
+    "dehydration": ("Low fluids", "Drink ORS."),
+    "diarrhea": ("Contaminated food", "Hydrate."),
+    "sunburn": ("UV exposure", "Use aloe vera."),
+    "heat rash": ("Blocked sweat glands", "Keep cool."),
+    "muscle cramps": ("Overuse", "Stretch, hydrate."),
+    "nausea": ("Indigestion", "Rest, sip fluids."),
+    "sore throat": ("Infection", "Gargle,drink warm fluids.")
+}
+BUILTIN_SYNONYMS = {
+    "fatigue": "tiredness;exhaustion",
+    "vomiting": "throwing up",
+    "diarrhea": "diarrhoea;loose motions",
+    "muscle cramps": "cramps",
+    "sore throat": "throat pain",
+}
+
+
+def builtin_table():
+    return pd.DataFrame(
+        [(sym, BUILTIN_SYNONYMS.get(sym, ""), cause, advice) for sym, (cause, advice) in BUILTIN_SYMPTOMS.items()],
+        columns=["symptom", "synonyms", "condition", "advice"],
+    )
+
+
+def _deletions(term):
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+class SymptomIndex:
+    def __init__(self, table):
+        table = table.fillna("")
+        self.symptoms = []  # canonical names, in first-seen order
+        self.conditions = []
+        self._symptom_ids = {}
+        self._condition_ids = {}
+        self._advice = {}
+        self._postings = []  # symptom id -> set of condition ids
+        aliases = {}
+
+        for symptom, synonyms, condition, advice in table[["symptom", "synonyms", "condition", "advice"]].itertuples(index=False):
+            symptom = symptom.strip().lower()
+            if not symptom:
+                continue
+            sid = self._symptom_ids.get(symptom)
+            if sid is None:
+                sid = self._symptom_ids[symptom] = len(self.symptoms)
+                self.symptoms.append(symptom)
+                self._postings.append(set())
+                aliases[symptom] = sid
+            for synonym in str(synonyms).split(";"):
+                if synonym.strip():
+                    aliases.setdefault(synonym.strip().lower(), sid)
+            if advice and sid not in self._advice:
+                self._advice[sid] = advice
+            condition = str(condition).strip()
+            if condition:
+                cid = self._condition_ids.get(condition)
+                if cid is None:
+                    cid = self._condition_ids[condition] = len(self.conditions)
+                    self.conditions.append(condition)
+                self._postings[sid].add(cid)
+
+        self._condition_sizes = Counter(cid for postings in self._postings for cid in postings)
+        self._aliases = aliases
+        self._names = sorted(aliases)
+        self._fuzzy = {}
+        for name in self._names:
+            for length in range(FUZZY_MIN_LEN, min(len(name), FUZZY_PREFIX_LEN) + 1):
+                prefix = name[:length]
+                for key in _deletions(prefix) | {prefix}:
+                    self._fuzzy.setdefault(key, set()).add(name)
+
+    def __len__(self):
+        return len(self.symptoms)
+
+    def resolve(self, name):
+        """Canonical symptom for a name or synonym, or None."""
+        sid = self._aliases.get(name.strip().lower())
+        return None if sid is None else self.symptoms[sid]
+
+    def info(self, symptom):
+        """``(cause, advice)`` for a symptom, as shown under each selection."""
+        sid = self._aliases.get(symptom.strip().lower())
+        if sid is None:
+            return "Unknown", "Consult a doctor."
+        causes = ", ".join(self.conditions[cid] for cid in sorted(self._postings[sid])) or "Unknown"
+        return causes, self._advice.get(sid, "Consult a doctor.")
+
+    def rank(self, selected, limit=5):
+        """Conditions ordered by how many selected symptoms they explain.
+
+        Ties go to the condition whose symptom set is covered best. Returns
+        ``(condition, matched_count, coverage)`` tuples.
+        """
+        overlap = Counter()
+        for name in selected:
+            sid = self._aliases.get(name.strip().lower())
+            if sid is not None:
+                overlap.update(self._postings[sid])
+        ranked = sorted(overlap.items(), key=lambda item: (-item[1], -item[1] / self._condition_sizes[item[0]]))
+        return [(self.conditions[cid], n, n / self._condition_sizes[cid]) for cid, n in ranked[:limit]]
+
+    def search(self, query, limit=20):
+        """Canonical symptoms whose name or synonym starts with ``query``.
+
+        Exact prefix matches come first; queries of at least
+        ``FUZZY_MIN_LEN`` characters then also match with one typo.
+        """
+        query = query.strip().lower()
+        if not query:
+            return self.symptoms[:limit]
+        results = []
+        seen = set()
+
+        def add(name):
+            sid = self._aliases[name]
+            if sid not in seen:
+                seen.add(sid)
+                results.append(self.symptoms[sid])
+
+        i = bisect_left(self._names, query)
+        while i < len(self._names) and self._names[i].startswith(query) and len(results) < limit:
+            add(self._names[i])
+            i += 1
+        if len(results) < limit and len(query) >= FUZZY_MIN_LEN:
+            key = query[:FUZZY_PREFIX_LEN]
+            candidates = set()
+            for variant in _deletions(key) | {key}:
+                candidates |= self._fuzzy.get(variant, set())
+            for name in sorted(candidates):
+                if len(results) >= limit:
+                    break
+                add(name)
+        return results
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_symptom_index():
+    """Build the index on first use and share it across sessions."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            table = pd.read_csv(SYMPTOM_TABLE, dtype=str) if SYMPTOM_TABLE else builtin_table()
+            if "synonyms" not in table.columns:
+                table["synonyms"] = ""
+            if "advice" not in table.columns:
+                table["advice"] = ""
+            _index = SymptomIndex(table)
+        return _index
@@ -0,0 +1,153 @@
+"""Indexed, process-wide view of the users CSV.
+
+Streamlit re-runs the page script on every interaction, but imported modules
+stay in ``sys.modules``, so the index built here is shared by every session in
+the server process. Lookups are plain dict hits; the file is only re-read when
+its size/mtime changes, and then only the bytes appended since the last read.
+"""
+import csv
+import io
+import os
+import tempfile
+import threading
+
+from locking import file_lock
+
+USER_COLUMNS = ["username", "password"]
+
+
+class UserStore:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._index = {}
+        self._columns = None  # (username_pos, password_pos), None when header is bad
+        self._has_header = False
+        self._offset = 0  # bytes of the file already folded into the index
+        self._stamp = None  # (inode, size, mtime_ns) at the last refresh
+
+    # ---------- Loading ----------
+    def _parse(self, text):
+        reader = csv.reader(io.StringIO(text))
+        if not self._has_header:
+            header = next(reader, None)
+            if header is None:
+                return
+            self._has_header = True
+            if all(col in header for col in USER_COLUMNS):
+                self._columns = (header.index("username"), header.index("password"))
+        if self._columns is None:
+            return
+        user_pos, pw_pos = self._columns
+        width = max(user_pos, pw_pos)
+        for row in reader:
+            if len(row) > width:
+                self._index.setdefault(row[user_pos], row[pw_pos])
+
+    def _refresh(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._reset()
+            return
+        stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+        if stamp == self._stamp:
+            return
+        # Same file that only grew: read the tail. Anything else: rebuild.
+        if self._stamp is None or st.st_ino != self._stamp[0] or st.st_size < self._offset:
+            self._reset()
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            chunk = f.read()
+        # Only fold in complete lines; a trailing partial row is left for the
+        # next refresh, once the writer has finished it.
+        complete = chunk.rfind(b"\n") + 1
+        self._parse(chunk[:complete].decode("utf-8"))
+        self._offset += complete
+        self._stamp = stamp
+
+    # ---------- Queries ----------
+    def get_password_hash(self, username):
+        with self._lock:
+            self._refresh()
+            return self._index.get(username)
+
+    def exists(self, username):
+        return self.get_password_hash(username) is not None
+
+    def is_valid(self):
+        """False when the file exists but lacks the username/password header."""
+        with self._lock:
+            self._refresh()
+            return self._stamp is None or self._columns is not None
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._index)
+
+    # ---------- Writes ----------
+    def add(self, username, password_hash):
+        # Refresh, header decision and append all happen under the file lock,
+        # so two processes creating the file can't both write a header.
+        with self._lock, file_lock(self.path):
+            self._refresh()
+            new_file = self._stamp is None or self._stamp[1] == 0
+            buf = io.StringIO()
+            writer = csv.writer(buf, lineterminator="\n")
+            if new_file:
+                writer.writerow(USER_COLUMNS)
+            writer.writerow([username, password_hash])
+            data = buf.getvalue().encode("utf-8")
+            with open(self.path, "ab") as f:
+                f.write(data)
+            st = os.stat(self.path)
+            if st.st_size != self._offset + len(data) or (self._columns is None and not new_file):
+                return  # an unlocked writer interleaved; the next refresh re-reads the tail
+            # Nobody else touched the file between our refresh and append, so
+            # fold the row in directly instead of re-reading it.
+            if new_file:
+                self._has_header = True
+                self._columns = (0, 1)
+            self._index.setdefault(username, password_hash)
+            self._offset = st.st_size
+            self._stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def update(self, username, password_hash):
+        """Replace a user's stored hash; the file is rewritten atomically."""
+        with self._lock, file_lock(self.path):
+            # Under the file lock no signup can land between the read and the
+            # replace below.
+            self._refresh()
+            if self._columns is None or username not in self._index:
+                return False
+            user_pos, pw_pos = self._columns
+            with open(self.path, newline="", encoding="utf-8") as f:
+                rows = list(csv.reader(f))
+            for row in rows[1:]:
+                if len(row) > max(user_pos, pw_pos) and row[user_pos] == username:
+                    row[pw_pos] = password_hash
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=".tmp_users_")
+            with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+                csv.writer(f, lineterminator="\n").writerows(rows)
+            os.replace(tmp, self.path)
+            self._reset()
+            self._refresh()
+            return True
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_user_store(path):
+    """Return the process-wide store for ``path``, creating it on first use."""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = UserStore(key)
+        return store